@@ -33,7 +33,8 @@ class HDFCSkyAPI:
     
     def __init__(self, api_key: str, api_secret: str, token_id: Optional[str] = None,
                  client_id: Optional[str] = None, email: Optional[str] = None, 
-                 mobile: Optional[str] = None, access_token: Optional[str] = None):
+                 mobile: Optional[str] = None, access_token: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialize HDFC Sky API client
         
@@ -45,6 +46,7 @@ class HDFCSkyAPI:
             email: Email ID (optional, for login)
             mobile: Mobile number (optional, for login)
             access_token: JWT access token from localStorage.accessToken (optional, if from web login)
+            session: Shared requests.Session (optional); a private one is created otherwise
         """
         self.api_key = api_key
         self.api_secret = api_secret
@@ -53,6 +55,10 @@ class HDFCSkyAPI:
         self.email = email
         self.mobile = mobile
         
+        # Every call goes through one session so the TLS connection to
+        # developer.hdfcsky.com is kept alive between requests
+        self.session = session or requests.Session()
+        
         # Session tokens
         # Load access_token from parameter or environment variable
         self.access_token: Optional[str] = access_token or os.getenv("HDFC_SKY_ACCESS_TOKEN")
@@ -266,7 +272,7 @@ class HDFCSkyAPI:
                     if idx != 3:
                         url = endpoint
                     
-                    response = requests.post(url, headers=headers, json=request_payload, timeout=10)
+                    response = self.session.post(url, headers=headers, json=request_payload, timeout=10)
                     
                     if response.status_code == 200:
                         return response.json()
@@ -315,7 +321,7 @@ class HDFCSkyAPI:
         else:
             raise ValueError("Must provide client_id, email, or mobile in init or as parameter")
         
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
+        response = self.session.post(url, headers=headers, json=payload, timeout=10)
         response.raise_for_status()
         
         result = response.json()
@@ -353,7 +359,7 @@ class HDFCSkyAPI:
             "pin": pin
         }
         
-        response = requests.post(url, headers=headers, params=params, json=payload, timeout=10)
+        response = self.session.post(url, headers=headers, params=params, json=payload, timeout=10)
         response.raise_for_status()
         
         result = response.json()
@@ -425,7 +431,7 @@ class HDFCSkyAPI:
             "validity": validity
         }
         
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
+        response = self.session.post(url, headers=headers, json=payload, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -452,7 +458,7 @@ class HDFCSkyAPI:
         if order_type:
             payload["order_type"] = order_type
         
-        response = requests.put(url, headers=headers, json=payload, timeout=10)
+        response = self.session.put(url, headers=headers, json=payload, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -465,7 +471,7 @@ class HDFCSkyAPI:
         url = f"{self.TRADING_API_BASE}/orders/{order_id}"
         headers = self._get_api_headers(include_auth=True, trading_api=True)
         
-        response = requests.delete(url, headers=headers, timeout=10)
+        response = self.session.delete(url, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -494,7 +500,7 @@ class HDFCSkyAPI:
         if self.client_id:
             params["client_id"] = self.client_id
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = self.session.get(url, headers=headers, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -513,7 +519,7 @@ class HDFCSkyAPI:
         url = f"{self.TRADING_API_BASE}/api/v2/trades"
         headers = self._get_api_headers(include_auth=True, trading_api=True)
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = self.session.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -538,7 +544,7 @@ class HDFCSkyAPI:
         headers = self._get_api_headers(include_auth=True, trading_api=True)
         params = {"type": position_type}
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = self.session.get(url, headers=headers, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -557,7 +563,7 @@ class HDFCSkyAPI:
         url = f"{self.TRADING_API_BASE}/api/v2/holdings"
         headers = self._get_api_headers(include_auth=True, trading_api=True)
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = self.session.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -588,7 +594,7 @@ class HDFCSkyAPI:
             "exchange": exchange
         }
         
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
+        response = self.session.post(url, headers=headers, json=payload, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -615,7 +621,7 @@ class HDFCSkyAPI:
         if self.client_id:
             params["client_id"] = self.client_id
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = self.session.get(url, headers=headers, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
     
@@ -665,7 +671,7 @@ class HDFCSkyAPI:
             "end": end_date
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = self.session.get(url, headers=headers, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
 
@@ -25,7 +25,8 @@ class KotakNeoAPI:
     API_HEADER_KEY = "neo-fin-key"
     API_HEADER_VALUE = "neotradeapi"
     
-    def __init__(self, access_token: str, mobile_number: str, client_code: str):
+    def __init__(self, access_token: str, mobile_number: str, client_code: str,
+                 session: Optional[requests.Session] = None):
         """
         Initialize Kotak Neo API client
         
@@ -33,10 +34,13 @@ class KotakNeoAPI:
             access_token: API access token from NEO App → Invest → Trade API
             mobile_number: Mobile number in format +91XXXXXXXXXX
             client_code: Client code (UCC)
+            session: Shared requests.Session (optional); a private one is created otherwise
         """
         self.access_token = access_token
         self.mobile_number = mobile_number
         self.client_code = client_code
+        # Pooled keep-alive connections across login, MPIN and data calls
+        self.session = session or requests.Session()
         
         # Session tokens (set after login)
         self.view_token: Optional[str] = None
@@ -90,7 +94,7 @@ class KotakNeoAPI:
             "totp": totp
         }
         
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.session.post(url, headers=headers, json=payload)
         response.raise_for_status()
         
         data = response.json()
@@ -121,7 +125,7 @@ class KotakNeoAPI:
             "mpin": mpin
         }
         
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.session.post(url, headers=headers, json=payload)
         response.raise_for_status()
         
         data = response.json()
@@ -143,6 +147,42 @@ class KotakNeoAPI:
             return False
         return True
     
+    def session_state(self) -> Dict:
+        """
+        Snapshot of the session tokens, for persisting between runs
+        
+        Returns:
+            JSON-serialisable dict accepted by restore_session()
+        """
+        return {
+            "view_token": self.view_token,
+            "view_sid": self.view_sid,
+            "trade_token": self.trade_token,
+            "trade_sid": self.trade_sid,
+            "base_url": self.base_url,
+            "token_expiry": self.token_expiry.isoformat() if self.token_expiry else None,
+        }
+    
+    def restore_session(self, view_token: Optional[str] = None, view_sid: Optional[str] = None,
+                        trade_token: Optional[str] = None, trade_sid: Optional[str] = None,
+                        base_url: Optional[str] = None, token_expiry: Optional[str] = None) -> bool:
+        """
+        Reuse tokens from an earlier TOTP + MPIN login instead of logging in again
+        
+        Args:
+            Fields as returned by session_state(); token_expiry is an ISO timestamp
+            
+        Returns:
+            True if the restored session is authenticated and unexpired
+        """
+        self.view_token = view_token
+        self.view_sid = view_sid
+        self.trade_token = trade_token
+        self.trade_sid = trade_sid
+        self.base_url = base_url
+        self.token_expiry = datetime.fromisoformat(token_expiry) if token_expiry else None
+        return self.is_authenticated()
+    
     # ==================== ORDERS ====================
     
     def place_order(self, symbol: str, exchange: str, quantity: int, 
@@ -190,7 +230,7 @@ class KotakNeoAPI:
         # Form-encoded with jData as JSON string
         data = {"jData": json.dumps(j_data)}
         
-        response = requests.post(url, headers=headers, data=data)
+        response = self.session.post(url, headers=headers, data=data)
         response.raise_for_status()
         return response.json()
     
@@ -224,7 +264,7 @@ class KotakNeoAPI:
         
         data = {"jData": json.dumps(j_data)}
         
-        response = requests.post(url, headers=headers, data=data)
+        response = self.session.post(url, headers=headers, data=data)
         response.raise_for_status()
         return response.json()
     
@@ -247,7 +287,7 @@ class KotakNeoAPI:
         j_data = {"on": order_no, "am": "NO"}
         data = {"jData": json.dumps(j_data)}
         
-        response = requests.post(url, headers=headers, data=data)
+        response = self.session.post(url, headers=headers, data=data)
         response.raise_for_status()
         return response.json()
     
@@ -262,7 +302,7 @@ class KotakNeoAPI:
         j_data = {"on": order_no, "am": "NO"}
         data = {"jData": json.dumps(j_data)}
         
-        response = requests.post(url, headers=headers, data=data)
+        response = self.session.post(url, headers=headers, data=data)
         response.raise_for_status()
         return response.json()
     
@@ -277,7 +317,7 @@ class KotakNeoAPI:
         j_data = {"on": order_no, "am": "NO"}
         data = {"jData": json.dumps(j_data)}
         
-        response = requests.post(url, headers=headers, data=data)
+        response = self.session.post(url, headers=headers, data=data)
         response.raise_for_status()
         return response.json()
     
@@ -291,7 +331,7 @@ class KotakNeoAPI:
         url = f"{self.base_url}/quick/user/orders"
         headers = self._get_api_headers()
         
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         response.raise_for_status()
         return response.json()
     
@@ -311,7 +351,7 @@ class KotakNeoAPI:
         j_data = {"nOrdNo": order_no}
         data = {"jData": json.dumps(j_data)}
         
-        response = requests.post(url, headers=headers, data=data)
+        response = self.session.post(url, headers=headers, data=data)
         response.raise_for_status()
         return response.json()
     
@@ -323,7 +363,7 @@ class KotakNeoAPI:
         url = f"{self.base_url}/quick/user/trades"
         headers = self._get_api_headers()
         
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         response.raise_for_status()
         return response.json()
     
@@ -337,7 +377,7 @@ class KotakNeoAPI:
         url = f"{self.base_url}/quick/user/positions"
         headers = self._get_api_headers()
         
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         response.raise_for_status()
         return response.json()
     
@@ -349,7 +389,7 @@ class KotakNeoAPI:
         url = f"{self.base_url}/portfolio/v1/holdings"
         headers = self._get_api_headers()
         
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         response.raise_for_status()
         return response.json()
     
@@ -373,7 +413,7 @@ class KotakNeoAPI:
             "Content-Type": "application/json"
         }
         
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         response.raise_for_status()
         return response.json()
     
@@ -391,7 +431,7 @@ class KotakNeoAPI:
             "Content-Type": "application/json"
         }
         
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         response.raise_for_status()
         return response.json()
 
@@ -30,4 +30,14 @@ def query_trade_by_id(trade_id: str) -> Dict[str, Any]:
     return resp.get("result", {})
 
 
-__all__ = ["query_trades_by_user", "query_trade_by_id"]
+def query_trades_by_ids(trade_ids: List[str]) -> List[Dict[str, Any]]:
+    """Fetch several trades in a single chaincode round-trip."""
+    if not trade_ids:
+        return []
+    client = FabricClient()
+    logger.info("Querying %d trades by id", len(trade_ids))
+    resp = client.query("queryTradesByIds", {"trade_ids": list(trade_ids)})
+    return resp.get("result", [])
+
+
+__all__ = ["query_trades_by_user", "query_trade_by_id", "query_trades_by_ids"]
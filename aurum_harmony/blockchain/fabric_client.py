@@ -9,7 +9,8 @@ safe stub that you can later replace with a real SDK or REST gateway.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
+import json
 import os
 import logging
 
@@ -153,6 +154,55 @@ class FabricClient:
             logger.error("Fabric query failed: %s", str(e))
             return {"status": "ERROR", "result": [], "message": str(e)}
 
+    def query_stream(self, function: str, args: Dict[str, Any]) -> Iterator[Any]:
+        """
+        Query chaincode (read‑only), yielding result records one at a time.
+        Reads the gateway's NDJSON /query/stream endpoint line by line.
+
+        A stream that fails part way ends with an {"status": "ERROR", ...}
+        record, like query()'s error result, rather than just stopping.
+        """
+        if not self.config.gateway_url:
+            logger.info(
+                "FabricClient.query_stream called without FABRIC_GATEWAY_URL set. "
+                "This is a NO‑OP stub. function=%s args=%s",
+                function,
+                args,
+            )
+            return
+
+        try:
+            import requests
+            gateway_url = f"{self.config.gateway_url.rstrip('/')}/query/stream"
+            payload = {
+                "function": function,
+                "args": args
+            }
+
+            logger.info(
+                "Streaming query from Fabric gateway at %s: function=%s",
+                gateway_url,
+                function,
+            )
+
+            with requests.post(
+                gateway_url,
+                json=payload,
+                timeout=30,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+
+        except ImportError:
+            logger.warning("requests library not installed. Install with: pip install requests")
+            yield {"status": "ERROR", "message": "requests library required"}
+        except Exception as e:
+            logger.error("Fabric query stream failed: %s", str(e))
+            yield {"status": "ERROR", "message": str(e)}
+
 
 __all__ = ["FabricConfig", "FabricClient", "load_fabric_config"]
 
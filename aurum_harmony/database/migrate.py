@@ -5,6 +5,8 @@ Migrates existing data to new schema if needed.
 
 import os
 import sys
+import time
+from hashlib import sha256
 from pathlib import Path
 
 # Fix Windows console encoding for Unicode characters
@@ -321,6 +323,62 @@ def migrate_user_fields():
         print("[OK] All user fields already exist")
 
 
+USER_FIELDS_VERSION = 'user_fields'
+
+
+def migration_digest():
+    """SHA-256 of this module's source; changes whenever a migration step changes."""
+    return sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def _ensure_migration_ledger():
+    db.session.execute(db.text(
+        'CREATE TABLE IF NOT EXISTS _migrations ('
+        'version VARCHAR(64) PRIMARY KEY, '
+        'sha VARCHAR(64) NOT NULL, '
+        'applied_at INTEGER NOT NULL)'
+    ))
+    db.session.commit()
+
+
+def is_migration_applied(version, digest):
+    """True if `version` was last applied from migration code with this digest."""
+    _ensure_migration_ledger()
+    row = db.session.execute(
+        db.text('SELECT sha FROM _migrations WHERE version = :version'),
+        {'version': version},
+    ).first()
+    return row is not None and row[0] == digest
+
+
+def record_migration(version, digest):
+    """Store the digest of the migration code that `version` was applied from."""
+    _ensure_migration_ledger()
+    db.session.execute(
+        db.text('DELETE FROM _migrations WHERE version = :version'),
+        {'version': version},
+    )
+    db.session.execute(
+        db.text('INSERT INTO _migrations (version, sha, applied_at) VALUES (:version, :sha, :applied_at)'),
+        {'version': version, 'sha': digest, 'applied_at': int(time.time())},
+    )
+    db.session.commit()
+
+
+def run_user_fields_migration(force=False):
+    """
+    Run migrate_user_fields() unless the ledger shows it already ran from
+    the current migration code. Returns True if the migration ran.
+    Must be called inside an app context.
+    """
+    digest = migration_digest()
+    if not force and is_migration_applied(USER_FIELDS_VERSION, digest):
+        return False
+    migrate_user_fields()
+    record_migration(USER_FIELDS_VERSION, digest)
+    return True
+
+
 def main():
     """Run all migrations."""
     print("=" * 60)
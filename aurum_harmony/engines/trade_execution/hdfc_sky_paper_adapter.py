@@ -59,7 +59,9 @@ class HDFCSkyPaperAdapter(BrokerAdapter):
         self._positions: Dict[str, Position] = {}
         self._balance: Decimal = Decimal(str(initial_balance))
         self._initial_balance: Decimal = Decimal(str(initial_balance))
-        self._lock = threading.Lock()
+        # Re-entrant: place_order/get_positions hold it while
+        # _get_live_price updates the price cache
+        self._lock = threading.RLock()
         self._price_cache: Dict[str, float] = {}
         self._price_cache_time: Dict[str, float] = {}
         self.price_update_interval = price_update_interval
@@ -79,7 +81,8 @@ class HDFCSkyPaperAdapter(BrokerAdapter):
             Current price or None if unavailable
         """
         cache_key = f"{exchange}:{symbol}"
-        current_time = time.time()
+        # Monotonic so the TTL is unaffected by wall-clock adjustments
+        current_time = time.monotonic()
         
         # Check cache first
         if cache_key in self._price_cache:
@@ -16,6 +16,7 @@ if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
 # Import all clean engines (Ver 10)
+from engines import clock
 from engines.predictive_ai.VIX_Adjustment_Logic import VIXAdjustment
 from engines.predictive_ai.Predictive_AI_Engine import PredictiveAIEngine
 from engines.compliance.SEBI_Compliance_Engine import compliance_engine
@@ -69,32 +70,20 @@ if AUTH_AVAILABLE:
     try:
         init_db(app)
         
-        # Smart migration: Only run if flag file doesn't exist
-        # This speeds up subsequent startups significantly
-        from pathlib import Path
-        migration_flag = Path(os.path.join(BASE_DIR, "_local", ".db_migration_completed"))
-        
-        # Create _local directory if it doesn't exist
-        migration_flag.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Check if we need to run migrations
+        # Smart migration: the _migrations ledger records the hash of the
+        # migration code, so this only does work when that code changes
         FORCE_MIGRATION = os.getenv("FORCE_DB_MIGRATION", "false").lower() == "true"
         
-        if FORCE_MIGRATION or not migration_flag.exists():
-            print("Running database migrations...")
-            try:
-                from aurum_harmony.database.migrate import migrate_user_fields
-                with app.app_context():
-                    migrate_user_fields()
-                    # Mark migration as completed
-                    migration_flag.touch()
+        try:
+            from aurum_harmony.database.migrate import run_user_fields_migration
+            with app.app_context():
+                if run_user_fields_migration(force=FORCE_MIGRATION):
                     print("[OK] Database migrations completed")
-            except Exception as migration_error:
-                import logging
-                logging.warning(f"Migration error (non-fatal): {migration_error}")
-                # Don't create flag if migration failed
-        else:
-            print("[OK] Database migrations already completed (skipping)")
+                else:
+                    print("[OK] Database migrations already completed (skipping)")
+        except Exception as migration_error:
+            import logging
+            logging.warning(f"Migration error (non-fatal): {migration_error}")
         
         app.register_blueprint(auth_bp)
         app.register_blueprint(password_change_bp)
@@ -153,6 +142,7 @@ def health():
 
 @app.route("/predict", methods=["POST"])
 def predict():
+    clock.tick()
     data = request.json
     features = data["features"]
     capital = data.get("capital", 10000)
@@ -171,7 +161,7 @@ def predict():
         "vix_adjustment": vix_result,
         "prediction": prediction,
         "risk": risk_result,
-            "timestamp": int(time.time()),
+            "timestamp": clock.stamp(),
         }
     )
 
@@ -186,6 +176,7 @@ def settle():
         "gross_profit": 25000
     }
     """
+    clock.tick()
     data = request.json
     result = settlement_engine.settle(
         data["user_id"],
@@ -201,6 +192,7 @@ def user_report(user_id: str):
     """
     Simple user-level PnL summary, backed by the reporting engine.
     """
+    clock.tick()
     summary = reporting_engine.user_trade_summary(user_id)
     return jsonify(summary)
 
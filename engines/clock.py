@@ -0,0 +1,37 @@
+# engines/clock.py
+"""
+Shared per-request timestamp for engine results.
+
+The orchestrator calls tick() once at the start of a request / bar; engines
+then call stamp() instead of int(time.time()), so every result produced for
+that request carries the same second, even when the request straddles a
+second boundary. The point is consistency across one request's records,
+not fewer clock reads: stamp() still reads the monotonic clock each call.
+
+The value lives in a ContextVar, so concurrent requests on other threads
+never see each other's stamp, and it expires after MAX_AGE seconds: callers
+that never tick() (background jobs, engines used directly) still get a
+current time rather than one frozen at some earlier request.
+"""
+import time
+from contextvars import ContextVar
+
+MAX_AGE = 1.0
+
+# (epoch seconds, monotonic time of the tick), or None before the first tick
+_ts = ContextVar("engine_clock_ts", default=None)
+
+
+def tick() -> int:
+    """Refresh this context's timestamp (seconds since epoch) and return it."""
+    t = int(time.time())
+    _ts.set((t, time.monotonic()))
+    return t
+
+
+def stamp() -> int:
+    """This context's last tick() if under MAX_AGE seconds old, else a fresh tick()."""
+    cached = _ts.get()
+    if cached is not None and time.monotonic() - cached[1] < MAX_AGE:
+        return cached[0]
+    return tick()
@@ -2,6 +2,8 @@
 import time
 import requests
 
+from engines import clock
+
 
 class SEBIComplianceEngine:
     def __init__(self, hyperledger_client=None):
@@ -48,7 +50,7 @@ class SEBIComplianceEngine:
                 {
                     "trade_id": trade.get("id"),
                     "status": "pass" if trade else "fail",
-                    "timestamp": int(time.time()),
+                    "timestamp": clock.stamp(),
                 }
             )
 
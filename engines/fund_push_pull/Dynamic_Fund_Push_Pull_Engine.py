@@ -1,7 +1,8 @@
 # engines/fund_push_pull/Dynamic_Fund_Push_Pull_Engine.py
-import time
 from datetime import datetime
 
+from engines import clock
+
 
 class DynamicFundPushPull:
     def __init__(self, upi_client=None, hyperledger_client=None):
@@ -21,7 +22,7 @@ class DynamicFundPushPull:
             "user_id": user_id,
             "amount": amount,
             "action": "push",
-            "timestamp": int(time.time()),
+            "timestamp": clock.stamp(),
         }
         if self.upi_client:
             success = self.upi_client.send(amount, user_id)
@@ -35,7 +36,7 @@ class DynamicFundPushPull:
             "user_id": user_id,
             "amount": amount,
             "action": "pull",
-            "timestamp": int(time.time()),
+            "timestamp": clock.stamp(),
         }
         if self.upi_client:
             success = self.upi_client.receive(amount, user_id)
@@ -1,7 +1,43 @@
 # engines/notifications/Notifications.py
 import smtplib
+import ssl
 from email.mime.text import MIMEText
-import time
+
+from engines import clock
+
+
+class _ResumableSMTP(smtplib.SMTP):
+    """SMTP whose STARTTLS can resume a previous TLS session (skips the full handshake)."""
+
+    def __init__(self, *args, ssl_session=None, **kwargs):
+        self._ssl_session = ssl_session
+        super().__init__(*args, **kwargs)
+
+    def starttls(self, context):
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("starttls"):
+            raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server.")
+        resp, reply = self.docmd("STARTTLS")
+        if resp != 220:
+            raise smtplib.SMTPResponseException(resp, reply)
+        self.sock = context.wrap_socket(
+            self.sock, server_hostname=self._host, session=self._ssl_session
+        )
+        # RFC 3207: forget everything learned before TLS
+        self.file = None
+        self.helo_resp = None
+        self.ehlo_resp = None
+        self.esmtp_features = {}
+        self.does_esmtp = False
+        return resp, reply
+
+
+def _smtp_tls_context() -> ssl.SSLContext:
+    # AES-GCM over ECDHE only (hardware-accelerated on AES-NI builds of OpenSSL)
+    ctx = ssl.create_default_context()
+    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+    ctx.set_ciphers("ECDHE+AESGCM:!aNULL")
+    return ctx
 
 
 class NotificationEngine:
@@ -11,6 +47,10 @@ class NotificationEngine:
         self.smtp_port = 587
         self.sender = "alerts@aurumharmony.in"
         self.max_per_day = 5
+        # Shared TLS context + last session, so reconnects resume instead of
+        # doing a full handshake on every send
+        self._tls_context = _smtp_tls_context()
+        self._ssl_session = None
 
     def send(self, user_id: str, email: str, message: str, profit: float = 0) -> dict:
         """
@@ -34,11 +74,14 @@ class NotificationEngine:
         msg["To"] = email
 
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10) as server:
-                server.starttls()
+            with _ResumableSMTP(
+                self.smtp_server, self.smtp_port, timeout=10, ssl_session=self._ssl_session
+            ) as server:
+                server.starttls(context=self._tls_context)
                 # Credentials must be injected at runtime, never stored in repo.
                 # server.login(os.getenv("SMTP_USER"), os.getenv("SMTP_PASS"))
                 server.send_message(msg)
+                self._ssl_session = server.sock.session
             status = "sent"
         except Exception as exc:
             status = f"failed: {exc}"
@@ -49,7 +92,7 @@ class NotificationEngine:
             "tier": tier,
             "profit": profit,
             "status": status,
-            "timestamp": int(time.time()),
+            "timestamp": clock.stamp(),
         }
 
         if self.hyperledger_client:
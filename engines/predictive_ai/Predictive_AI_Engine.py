@@ -3,22 +3,30 @@ import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
-import time
 from typing import List
 
+from engines import clock
+
 
 class PredictiveAIEngine:
     def __init__(self, hyperledger_client=None):
-        self.rf_model = RandomForestClassifier(n_estimators=200, random_state=42)
+        self.rf_model = RandomForestClassifier(
+            n_estimators=200, n_jobs=-1, random_state=42
+        )
         self.lstm_model = None
+        self._lstm_tflite = None
+        self._interp = None
         self.hyperledger_client = hyperledger_client
         self.confidence_threshold = 0.70
+        self._feat_names = ("rsi", "atr", "vix", "oi_change", "volume_spike")
+        self._directions = ("bearish", "neutral", "bullish")
 
     def train_rf(self, data: pd.DataFrame) -> float:
-        X = data[["rsi", "atr", "vix", "oi_change", "volume_spike"]]
-        y = data["direction"]
+        # Fit on a bare float32 ndarray: predict() passes plain rows without
+        # sklearn's feature-name warning, and float32 is the trees' native
+        # DTYPE, so neither fit nor predict_proba converts the input.
+        X = data[list(self._feat_names)].to_numpy(dtype=np.float32)
+        y = data["direction"].to_numpy()
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42
         )
@@ -26,11 +34,16 @@ class PredictiveAIEngine:
         accuracy = self.rf_model.score(X_test, y_test)
         if self.hyperledger_client:
             self.hyperledger_client.log_training(
-                {"model": "RF", "accuracy": accuracy, "timestamp": int(time.time())}
+                {"model": "RF", "accuracy": accuracy, "timestamp": clock.stamp()}
             )
         return accuracy
 
     def train_lstm(self, sequences: np.ndarray, labels: np.ndarray):
+        # TensorFlow is imported lazily: it costs seconds and hundreds of MB
+        # at import, and RF prediction / get_signals() never need it.
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense
+
         self.lstm_model = Sequential(
             [
                 LSTM(
@@ -51,26 +64,115 @@ class PredictiveAIEngine:
         accuracy = max(history.history["val_accuracy"])
         if self.hyperledger_client:
             self.hyperledger_client.log_training(
-                {"model": "LSTM", "accuracy": accuracy, "timestamp": int(time.time())}
+                {"model": "LSTM", "accuracy": accuracy, "timestamp": clock.stamp()}
             )
         return accuracy
 
+    def quantize_lstm(self, rep_data_gen) -> bytes:
+        """
+        Convert the trained LSTM to a fully int8-quantized TFLite model and
+        switch LSTM inference onto the TFLite interpreter.
+
+        rep_data_gen yields lists holding one float32 sequence of shape
+        (1, timesteps, features), used to calibrate activation ranges.
+        """
+        if self.lstm_model is None:
+            raise ValueError("LSTM model is not trained")
+
+        import tensorflow as tf
+
+        # LSTM int8 conversion needs a static batch size of 1 and the
+        # inference graph (training=False) traced as a concrete function.
+        _, timesteps, n_features = self.lstm_model.input_shape
+        run_model = tf.function(lambda x: self.lstm_model(x, training=False))
+        concrete_fn = run_model.get_concrete_function(
+            tf.TensorSpec([1, timesteps, n_features], tf.float32)
+        )
+
+        converter = tf.lite.TFLiteConverter.from_concrete_functions(
+            [concrete_fn], self.lstm_model
+        )
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = rep_data_gen
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+        self._lstm_tflite = converter.convert()
+
+        self._interp = tf.lite.Interpreter(model_content=self._lstm_tflite)
+        self._interp.allocate_tensors()
+        return self._lstm_tflite
+
+    def predict_lstm(self, sequence: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for one (timesteps, features) sequence.
+        Uses the int8 TFLite interpreter when quantize_lstm() has run.
+        """
+        if self.lstm_model is None:
+            raise ValueError("LSTM model is not trained")
+
+        x = np.asarray(sequence, dtype=np.float32).reshape(
+            (1,) + self.lstm_model.input_shape[1:]
+        )
+        if self._interp is None:
+            return self.lstm_model(x, training=False).numpy()[0]
+
+        inp = self._interp.get_input_details()[0]
+        out = self._interp.get_output_details()[0]
+        in_scale, in_zero = inp["quantization"]
+        x_q = np.clip(np.round(x / in_scale + in_zero), -128, 127).astype(np.int8)
+        self._interp.set_tensor(inp["index"], x_q)
+        self._interp.invoke()
+        y_q = self._interp.get_tensor(out["index"])[0]
+        out_scale, out_zero = out["quantization"]
+        return (y_q.astype(np.float32) - out_zero) * out_scale
+
     def predict(self, features: dict) -> dict:
-        rf_pred = self.rf_model.predict_proba([list(features.values())])[0]
-        rf_confidence = max(rf_pred)
-        direction = ["bearish", "neutral", "bullish"][np.argmax(rf_pred)]
-
-        if rf_confidence < self.confidence_threshold:
-            direction = "neutral"  # Force neutral if confidence low
-
-        result = {
-            "direction": direction,
-            "confidence": round(rf_confidence, 4),
-            "timestamp": int(time.time()),
-        }
-        if self.hyperledger_client:
-            self.hyperledger_client.log_prediction(result)
-        return result
+        # A fresh row per call: the engine is a shared singleton and Flask
+        # serves requests on several threads at once.
+        n_features = len(self._feat_names)
+        x = np.fromiter(
+            (features[name] for name in self._feat_names),
+            dtype=np.float32,
+            count=n_features,
+        ).reshape(1, n_features)
+        return self._predict_rows(x)[0]
+
+    def predict_batch(self, feats: List[dict]) -> List[dict]:
+        """
+        Predict direction for many feature dicts with a single predict_proba
+        call, amortizing sklearn's per-call dispatch across all signals.
+        """
+        if not feats:
+            return []
+        n_features = len(self._feat_names)
+        X = np.fromiter(
+            (f[name] for f in feats for name in self._feat_names),
+            dtype=np.float32,
+            count=len(feats) * n_features,
+        ).reshape(len(feats), n_features)
+        return self._predict_rows(X)
+
+    def _predict_rows(self, X: np.ndarray) -> List[dict]:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        probas = self.rf_model.predict_proba(X)
+        confidences = probas.max(axis=1)
+        idx = np.argmax(probas, axis=1)
+        # Force neutral if confidence low
+        idx = np.where(confidences < self.confidence_threshold, 1, idx)
+
+        timestamp = clock.stamp()
+        results = []
+        for i, confidence in zip(idx.tolist(), confidences.tolist()):
+            result = {
+                "direction": self._directions[i],
+                "confidence": round(confidence, 4),
+                "timestamp": timestamp,
+            }
+            if self.hyperledger_client:
+                self.hyperledger_client.log_prediction(result)
+            results.append(result)
+        return results
 
     def get_signals(self) -> List:
         """
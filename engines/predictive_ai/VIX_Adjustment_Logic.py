@@ -1,21 +1,47 @@
 # engines/predictive_ai/VIX_Adjustment_Logic.py
+import threading
 import numpy as np
-import time
+from bisect import bisect_right
+
+from engines import clock
+
+# VIX bucket edges and the (capacity, target_return, win_rate_lo, win_rate_hi)
+# row for each bucket: <15, 15-20, 20-30, >=30
+_VIX_EDGES = (15, 20, 30)
+_VIX_BUCKETS = (
+    (1.0, 0.10, 0.60, 0.66),
+    (0.75, 0.08, 0.55, 0.60),
+    (0.50, 0.07, 0.50, 0.55),
+    (0.50, 0.05, 0.45, 0.50),
+)
+_VIX_EDGES_ARR = np.array(_VIX_EDGES, dtype=np.float64)
+_CAP, _RET, _LO, _HI = (np.array(col) for col in zip(*_VIX_BUCKETS))
+_RNG_BLOCK = 4096
 
 
 class VIXAdjustment:
     def __init__(self, hyperledger_client=None):
         self.hyperledger_client = hyperledger_client
+        self._rng = np.random.default_rng()
+        self._buf = self._rng.random(_RNG_BLOCK)
+        self._idx = 0
+        # vix_adj is a shared singleton; the cursor check/read/advance in
+        # _u() must not interleave across request threads.
+        self._lock = threading.Lock()
+
+    def _u(self, lo: float, hi: float) -> float:
+        """Uniform draw in [lo, hi) served from a pre-filled block of randoms."""
+        with self._lock:
+            if self._idx >= _RNG_BLOCK:
+                self._buf = self._rng.random(_RNG_BLOCK)
+                self._idx = 0
+            v = self._buf[self._idx]
+            self._idx += 1
+        return lo + (hi - lo) * float(v)
 
     def adjust(self, vix: float, capital: float = 10000) -> dict:
-        if vix < 15:
-            capacity, target_return, win_rate = 1.0, 0.10, np.random.uniform(0.60, 0.66)
-        elif vix < 20:
-            capacity, target_return, win_rate = 0.75, 0.08, np.random.uniform(0.55, 0.60)
-        elif vix < 30:
-            capacity, target_return, win_rate = 0.50, 0.07, np.random.uniform(0.50, 0.55)
-        else:
-            capacity, target_return, win_rate = 0.50, 0.05, np.random.uniform(0.45, 0.50)
+        capacity, target_return, lo, hi = _VIX_BUCKETS[bisect_right(_VIX_EDGES, vix)]
+        win_rate = self._u(lo, hi)
 
         result = {
             "capacity": capacity,
@@ -26,9 +52,27 @@ class VIXAdjustment:
         }
         if self.hyperledger_client:
             self.hyperledger_client.log_vix_adjustment(
-                {**result, "vix": vix, "timestamp": int(time.time())}
+                {**result, "vix": vix, "timestamp": clock.stamp()}
             )
         return result
 
+    def adjust_series(self, vix: np.ndarray, capitals: np.ndarray) -> dict:
+        """
+        Vectorized adjust() over a VIX series and/or a cohort of capitals
+        (a scalar on either side is broadcast). Returns a dict of arrays.
+        """
+        vix, capitals = np.broadcast_arrays(
+            np.asarray(vix, dtype=np.float64), np.asarray(capitals, dtype=np.float64)
+        )
+        idx = np.searchsorted(_VIX_EDGES_ARR, vix, side="right")
+        capacity = _CAP[idx]
+        lo = _LO[idx]
+        win_rate = lo + (_HI[idx] - lo) * self._rng.random(idx.shape)
 
-
+        return {
+            "capacity": capacity,
+            "target_return": _RET[idx],
+            "win_rate": win_rate,
+            "adjusted_capital": capitals * capacity * 3,
+            "trades_per_day": (27 + (180 - 27) * capacity).astype(np.int64),
+        }
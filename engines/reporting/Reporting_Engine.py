@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 from typing import Dict, Any, List
-import time
 
+from engines import clock
 from aurum_harmony.blockchain.blockchain_reporting import (
     query_trades_by_user,
-    query_trade_by_id,
+    query_trades_by_ids,
 )
 
 
@@ -48,13 +48,20 @@ class ReportingEngine:
             "gross_profit": round(gross_profit, 2),
             "gross_loss": round(gross_loss, 2),
             "net_profit": round(net_profit, 2),
-            "timestamp": int(time.time()),
+            "timestamp": clock.stamp(),
         }
 
+    def bulk_trade_detail(self, trade_ids: List[str]) -> List[Dict[str, Any]]:
+        """Trade details for several IDs via one blockchain query."""
+        trades = query_trades_by_ids(trade_ids)
+        ts = clock.stamp()
+        return [{**t, "timestamp_queried": ts} for t in trades]
+
     def trade_detail(self, trade_id: str) -> Dict[str, Any]:
-        trade = query_trade_by_id(trade_id)
-        trade["timestamp_queried"] = int(time.time())
-        return trade
+        trades = self.bulk_trade_detail([trade_id])
+        if trades:
+            return trades[0]
+        return {"timestamp_queried": clock.stamp()}
 
 
 reporting_engine = ReportingEngine()
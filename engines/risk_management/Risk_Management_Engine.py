@@ -1,6 +1,49 @@
 # engines/risk_management/Risk_Management_Engine.py
 import numpy as np
-import time
+
+from engines import clock
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; fall back to plain Python kernels
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True, fastmath=True)
+def _var_cvar(returns, q):
+    """
+    Linear-time VaR/CVaR kernel: selects the q-quantile with np.partition and
+    averages the tail in a single pass.
+    """
+    k = int(q * returns.size)
+    if k >= returns.size:
+        k = returns.size - 1
+    part = np.partition(returns, k)
+    var = part[k]
+    s = 0.0
+    c = 0
+    for i in range(k + 1):
+        s += part[i]
+        c += 1
+    return var, s / c
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _dd_kernel(cap, peak, limit, out_pct, out_ok):
+    for i in prange(cap.size):
+        p = peak[i]
+        if p <= 0:
+            out_pct[i] = 0.0
+            out_ok[i] = True
+        else:
+            d = (p - cap[i]) / p
+            out_pct[i] = d
+            out_ok[i] = d <= limit
 
 
 class RiskManagementEngine:
@@ -15,16 +58,17 @@ class RiskManagementEngine:
         """
         Value at Risk (VaR) and Conditional VaR (CVaR) per user.
         """
-        var = np.percentile(returns, (1 - confidence) * 100)
-        cvar = returns[returns <= var].mean()
+        var, cvar = _var_cvar(
+            np.ascontiguousarray(returns, dtype=np.float64), 1 - confidence
+        )
 
         result = {
-            "var_95": round(var, 5),
-            "cvar_95": round(cvar, 5),
+            "var_95": round(float(var), 5),
+            "cvar_95": round(float(cvar), 5),
         }
         if self.hyperledger_client:
             self.hyperledger_client.log_risk_metrics(
-                {**result, "timestamp": int(time.time())}
+                {**result, "timestamp": clock.stamp()}
             )
         return result
 
@@ -35,19 +79,37 @@ class RiskManagementEngine:
         if peak <= 0:
             return {"ok": True, "drawdown_pct": 0.0}
 
+        # Plain float math: one value does not justify arrays or a call into
+        # the parallel batch kernel (and its JIT compile on first use)
         drawdown = (peak - capital) / peak
-        ok = drawdown <= self.max_drawdown
+
         result = {
-            "ok": ok,
+            "ok": drawdown <= self.max_drawdown,
             "drawdown_pct": round(drawdown, 5),
             "max_allowed": self.max_drawdown,
         }
         if self.hyperledger_client:
             self.hyperledger_client.log_drawdown_check(
-                {**result, "timestamp": int(time.time())}
+                {**result, "timestamp": clock.stamp()}
             )
         return result
 
+    def check_drawdown_batch(self, capitals: np.ndarray, peaks: np.ndarray) -> dict:
+        """
+        Drawdown check for a whole cohort at once (e.g. EOD sweep over all
+        users). Returns parallel arrays aligned with the inputs.
+        """
+        cap = np.ascontiguousarray(capitals, dtype=np.float64)
+        peak = np.ascontiguousarray(peaks, dtype=np.float64)
+        out_pct = np.empty(cap.size, dtype=np.float64)
+        out_ok = np.empty(cap.size, dtype=np.bool_)
+        _dd_kernel(cap, peak, self.max_drawdown, out_pct, out_ok)
+        return {
+            "ok": out_ok,
+            "drawdown_pct": out_pct,
+            "max_allowed": self.max_drawdown,
+        }
+
 
 risk_engine = RiskManagementEngine()
 
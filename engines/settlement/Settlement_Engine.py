@@ -1,5 +1,41 @@
 # engines/settlement/Settlement_Engine.py
-import time
+from typing import List, NamedTuple
+
+import numpy as np
+
+from engines import clock
+
+
+class FeeSchedule(NamedTuple):
+    """Fee splits in permille of gross profit."""
+
+    platform_permille: int
+    saffron_permille: int
+    zenith_permille: int
+
+
+# Beta: 30% platform fee -> SaffronBolt 70% / ZenithPulse 30% of it
+_BETA = FeeSchedule(300, 210, 90)
+# Post-Beta: 12% platform fee -> SaffronBolt 70% / ZenithPulse 15% of it
+_POST = FeeSchedule(120, 84, 18)
+
+
+def _share(gp_paise: int, permille: int) -> int:
+    """gp_paise * permille / 1000 in paise, rounded half-to-even.
+
+    Half-even is symmetric, so a loss settles to the negation of the
+    equivalent profit (floor division would round losses away from zero).
+    """
+    q, r = divmod(gp_paise * permille, 1000)
+    if r > 500 or (r == 500 and q % 2):
+        q += 1
+    return q
+
+
+def _share_array(gp_paise: np.ndarray, permille: int) -> np.ndarray:
+    """Vectorized _share() over int64 paise."""
+    q, r = np.divmod(gp_paise * permille, 1000)
+    return q + ((r > 500) | ((r == 500) & (q % 2 == 1)))
 
 
 class SettlementEngine:
@@ -12,28 +48,31 @@ class SettlementEngine:
         EOD settlement per user (₹10,000 base)
         Beta: 30% platform fee
         Post-Beta: 12% platform fee
-        """
-        platform_fee_pct = 0.30 if self.beta_phase else 0.12
-        platform_fee = gross_profit * platform_fee_pct
 
-        # Split platform fee
-        saffronbolt_share = platform_fee * 0.70
-        zenithpulse_share = (
-            platform_fee * 0.30 if self.beta_phase else platform_fee * 0.15
-        )
+        Amounts are computed in integer paise and rounded half-to-even, so
+        losses mirror profits and the sub-shares always sum to their split.
+        """
+        sched = _BETA if self.beta_phase else _POST
+        gp_paise = int(round(gross_profit * 100))
 
-        net_to_user = gross_profit - platform_fee
+        platform_paise = _share(gp_paise, sched.platform_permille)
+        # ZenithPulse takes the remainder of the allocated split, so the two
+        # sub-shares always add up (in beta, to exactly the platform fee)
+        allocated_paise = _share(gp_paise, sched.saffron_permille + sched.zenith_permille)
+        saffronbolt_paise = _share(gp_paise, sched.saffron_permille)
+        zenithpulse_paise = allocated_paise - saffronbolt_paise
+        net_paise = gp_paise - platform_paise
 
         result = {
             "user_id": user_id,
-            "gross_profit": round(gross_profit),
-            "platform_fee_pct": platform_fee_pct,
-            "platform_fee": round(platform_fee),
-            "saffronbolt_share": round(saffronbolt_share),
-            "zenithpulse_share": round(zenithpulse_share),
-            "net_to_user": round(net_to_user),
+            "gross_profit": gp_paise / 100,
+            "platform_fee_pct": sched.platform_permille / 1000,
+            "platform_fee": platform_paise / 100,
+            "saffronbolt_share": saffronbolt_paise / 100,
+            "zenithpulse_share": zenithpulse_paise / 100,
+            "net_to_user": net_paise / 100,
             "beta_phase": self.beta_phase,
-            "timestamp": int(time.time()),
+            "timestamp": clock.stamp(),
         }
 
         if self.hyperledger_client:
@@ -41,7 +80,50 @@ class SettlementEngine:
 
         return result
 
+    def settle_many(self, user_ids: List[str], gross_profits: np.ndarray) -> List[dict]:
+        """
+        EOD settlement for many users at once. Fee splits are computed as
+        vectorized int64 paise arithmetic; results match settle() per user.
+        """
+        sched = _BETA if self.beta_phase else _POST
+        gp_paise = np.rint(np.asarray(gross_profits, dtype=np.float64) * 100).astype(np.int64)
+        if gp_paise.shape != (len(user_ids),):
+            raise ValueError(
+                f"expected {len(user_ids)} gross profits, got shape {gp_paise.shape}"
+            )
 
-settlement_engine = SettlementEngine()
+        platform_paise = _share_array(gp_paise, sched.platform_permille)
+        allocated_paise = _share_array(gp_paise, sched.saffron_permille + sched.zenith_permille)
+        saffronbolt_paise = _share_array(gp_paise, sched.saffron_permille)
+        zenithpulse_paise = allocated_paise - saffronbolt_paise
+        net_paise = gp_paise - platform_paise
 
+        platform_fee_pct = sched.platform_permille / 1000
+        timestamp = clock.stamp()
+        results = []
+        for user_id, gp, fee, saffron, zenith, net in zip(
+            user_ids,
+            gp_paise.tolist(),
+            platform_paise.tolist(),
+            saffronbolt_paise.tolist(),
+            zenithpulse_paise.tolist(),
+            net_paise.tolist(),
+        ):
+            result = {
+                "user_id": user_id,
+                "gross_profit": gp / 100,
+                "platform_fee_pct": platform_fee_pct,
+                "platform_fee": fee / 100,
+                "saffronbolt_share": saffron / 100,
+                "zenithpulse_share": zenith / 100,
+                "net_to_user": net / 100,
+                "beta_phase": self.beta_phase,
+                "timestamp": timestamp,
+            }
+            if self.hyperledger_client:
+                self.hyperledger_client.log_settlement(result)
+            results.append(result)
+        return results
 
+
+settlement_engine = SettlementEngine()
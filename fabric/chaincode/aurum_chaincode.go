@@ -128,6 +128,31 @@ func (s *AurumChaincode) QueryTradesByUser(ctx contractapi.TransactionContextInt
 	return string(tradesJSON), nil
 }
 
+// QueryTradesByIDs queries several trades in one call; tradeIDsJSON is a JSON array of IDs
+func (s *AurumChaincode) QueryTradesByIDs(ctx contractapi.TransactionContextInterface, tradeIDsJSON string) (string, error) {
+	var tradeIDs []string
+	err := json.Unmarshal([]byte(tradeIDsJSON), &tradeIDs)
+	if err != nil {
+		return "", fmt.Errorf("failed to unmarshal trade IDs: %v", err)
+	}
+
+	trades := make([]TradeRecord, 0, len(tradeIDs))
+	for _, tradeID := range tradeIDs {
+		tradeKey := fmt.Sprintf("TRADE:%s", tradeID)
+		tradeBytes, err := ctx.GetStub().GetState(tradeKey)
+		if err != nil || tradeBytes == nil {
+			continue
+		}
+
+		var trade TradeRecord
+		json.Unmarshal(tradeBytes, &trade)
+		trades = append(trades, trade)
+	}
+
+	tradesJSON, _ := json.Marshal(trades)
+	return string(tradesJSON), nil
+}
+
 func main() {
 	aurumChaincode, err := contractapi.NewChaincode(&AurumChaincode{})
 	if err != nil {
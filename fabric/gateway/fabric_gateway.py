@@ -1,14 +1,20 @@
 """
 Hyperledger Fabric REST Gateway for AurumHarmony
 Provides HTTP API to interact with Fabric network
+
+Production: gunicorn -c gunicorn.conf.py fabric_gateway:app
+Local dev:  python fabric_gateway.py
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, stream_with_context
 from flask_cors import CORS
 import os
-import json
 import logging
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Iterator, Optional
+
+import orjson
+from cachetools import TTLCache
 
 # Note: This is a simplified gateway. For production, use Fabric SDK or Gateway SDK
 # This requires fabric-sdk-py or similar to be installed
@@ -27,15 +33,59 @@ CHAINCODE_NAME = os.getenv("FABRIC_CHAINCODE_NAME", "aurum_cc")
 # TODO: Initialize Fabric SDK connection here
 # For now, this is a stub that will be implemented with actual Fabric SDK
 
+# Short-lived cache of /query responses keyed by (function, canonical args).
+# Dashboards re-query the same trade repeatedly; 2s keeps reads fresh enough.
+#
+# The cache is per process. Under gunicorn (several workers) an /invoke or
+# /query/flush only clears the worker that served it, so other workers can
+# return pre-write results for up to QUERY_CACHE_TTL seconds - a client may
+# see its own write and then stale data. Deployments that need
+# read-your-writes set FABRIC_QUERY_CACHE_TTL=0 to disable the cache.
+QUERY_CACHE_TTL = float(os.getenv("FABRIC_QUERY_CACHE_TTL", "2.0"))
+_qcache = TTLCache(maxsize=4096, ttl=QUERY_CACHE_TTL) if QUERY_CACHE_TTL > 0 else None
+_qcache_lock = threading.Lock()
+
+
+def jresp(obj: Any, status: int = 200):
+    """JSON response serialized with orjson (replaces flask.jsonify)."""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype="application/json")
+
+
+def _query_key(function_name: str, args: Dict[str, Any]) -> tuple:
+    return function_name, orjson.dumps(args, option=orjson.OPT_SORT_KEYS, default=str)
+
+
+def _query_chaincode(function_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a read-only chaincode query."""
+    # TODO: Implement actual Fabric SDK query
+    # For now, return empty result
+    return {
+        "status": "success",
+        "function": function_name,
+        "result": [],
+        "message": "Query logged (Fabric SDK integration pending)"
+    }
+
+def _iter_query_chaincode(function_name: str, args: Dict[str, Any]) -> Iterator[Any]:
+    """Yield query result records one at a time.
+
+    The stub query above builds its whole result list, so nothing is
+    incremental yet on the gateway side; only the NDJSON wire format is.
+    """
+    yield from _query_chaincode(function_name, args).get("result", [])
+
+# Health payload never changes at runtime; serialize it once
+_HEALTH_BODY = orjson.dumps({
+    "status": "ok",
+    "service": "Fabric Gateway",
+    "channel": CHANNEL_NAME,
+    "chaincode": CHAINCODE_NAME
+})
+
 @app.route("/health", methods=["GET"])
 def health():
     """Health check endpoint"""
-    return jsonify({
-        "status": "ok",
-        "service": "Fabric Gateway",
-        "channel": CHANNEL_NAME,
-        "chaincode": CHAINCODE_NAME
-    }), 200
+    return Response(_HEALTH_BODY, status=200, mimetype="application/json")
 
 @app.route("/invoke", methods=["POST"])
 def invoke():
@@ -44,26 +94,31 @@ def invoke():
     Expected JSON: {"function": "RecordTrade", "args": {...}}
     """
     try:
-        data = request.json
+        data = orjson.loads(request.get_data())
         function_name = data.get("function")
         args = data.get("args", {})
         
         if not function_name:
-            return jsonify({"error": "function is required"}), 400
+            return jresp({"error": "function is required"}, 400)
         
         logger.info(f"Invoke: {function_name} with args: {args}")
+
+        # Writes may change any queried state; drop this worker's cached reads
+        if _qcache is not None:
+            with _qcache_lock:
+                _qcache.clear()
         
         # TODO: Implement actual Fabric SDK invoke
         # For now, return success
-        return jsonify({
+        return jresp({
             "status": "success",
             "function": function_name,
             "message": "Invoke logged (Fabric SDK integration pending)"
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Invoke error: {e}")
-        return jsonify({"error": str(e)}), 500
+        return jresp({"error": str(e)}, 500)
 
 @app.route("/query", methods=["POST"])
 def query():
@@ -72,30 +127,81 @@ def query():
     Expected JSON: {"function": "QueryTradeByID", "args": {"trade_id": "..."}}
     """
     try:
-        data = request.json
+        data = orjson.loads(request.get_data())
         function_name = data.get("function")
         args = data.get("args", {})
         
         if not function_name:
-            return jsonify({"error": "function is required"}), 400
+            return jresp({"error": "function is required"}, 400)
         
+        if _qcache is not None:
+            key = _query_key(function_name, args)
+            with _qcache_lock:
+                cached = _qcache.get(key)
+            if cached is not None:
+                return jresp(cached, 200)
+
         logger.info(f"Query: {function_name} with args: {args}")
         
-        # TODO: Implement actual Fabric SDK query
-        # For now, return empty result
-        return jsonify({
-            "status": "success",
-            "function": function_name,
-            "result": [],
-            "message": "Query logged (Fabric SDK integration pending)"
-        }), 200
+        result = _query_chaincode(function_name, args)
+        if _qcache is not None:
+            with _qcache_lock:
+                _qcache[key] = result
+        return jresp(result, 200)
         
     except Exception as e:
         logger.error(f"Query error: {e}")
-        return jsonify({"error": str(e)}), 500
+        return jresp({"error": str(e)}, 500)
+
+@app.route("/query/stream", methods=["POST"])
+def query_stream():
+    """
+    Streaming variant of /query: one JSON record per line (NDJSON)
+    Expected JSON: {"function": "QueryTradesByUser", "args": {"user_id": "..."}}
+    """
+    try:
+        data = orjson.loads(request.get_data())
+        function_name = data.get("function")
+        args = data.get("args", {})
+        
+        if not function_name:
+            return jresp({"error": "function is required"}, 400)
+        
+        logger.info(f"Query stream: {function_name} with args: {args}")
+        
+        def gen():
+            # Headers are already sent once records flow, so a failure part
+            # way through ends the stream with a {"status": "ERROR"} record,
+            # the same shape FabricClient.query_stream() yields on failure
+            try:
+                for record in _iter_query_chaincode(function_name, args):
+                    yield orjson.dumps(record) + b"\n"
+            except Exception as e:
+                logger.error(f"Query stream error: {e}")
+                yield orjson.dumps({"status": "ERROR", "message": str(e)}) + b"\n"
+        
+        return Response(stream_with_context(gen()), mimetype="application/x-ndjson")
+        
+    except Exception as e:
+        logger.error(f"Query stream error: {e}")
+        return jresp({"error": str(e)}, 500)
+
+@app.route("/query/flush", methods=["POST"])
+def query_flush():
+    """Invalidate the cached query responses of the worker serving this request.
+
+    Not a global flush: other gunicorn workers keep their entries until
+    QUERY_CACHE_TTL expires (see the note on _qcache).
+    """
+    if _qcache is not None:
+        with _qcache_lock:
+            _qcache.clear()
+    return jresp({"status": "success", "message": "Query cache flushed (this worker only)",
+                  "pid": os.getpid()}, 200)
 
 if __name__ == "__main__":
     logger.info(f"Starting Fabric Gateway on port {GATEWAY_PORT}")
     logger.info(f"Channel: {CHANNEL_NAME}, Chaincode: {CHAINCODE_NAME}")
-    app.run(host="0.0.0.0", port=GATEWAY_PORT, debug=True)
+    # Dev server only; production runs under gunicorn (see gunicorn.conf.py)
+    app.run(host="0.0.0.0", port=GATEWAY_PORT, debug=False, threaded=True)
 
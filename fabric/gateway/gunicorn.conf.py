@@ -0,0 +1,21 @@
+"""
+Gunicorn config for the Fabric REST Gateway.
+
+Usage (from fabric/gateway):
+  gunicorn -c gunicorn.conf.py fabric_gateway:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('FABRIC_GATEWAY_PORT', '8080')}"
+# One process per core; threads overlap the I/O-bound invoke/query calls.
+# Each worker has its own /query cache (see FABRIC_QUERY_CACHE_TTL in
+# fabric_gateway.py), so with more than one worker reads can lag a write
+# by up to that TTL.
+workers = int(os.getenv("FABRIC_GATEWAY_WORKERS", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.getenv("FABRIC_GATEWAY_THREADS", "8"))
+timeout = 60
+keepalive = 5
+accesslog = "-"
@@ -11,7 +11,6 @@ To force re-run migrations:
 
 import os
 import sys
-from pathlib import Path
 
 # Add project root to path
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -22,44 +21,33 @@ def run_migrations(force=False):
     """Run database migrations."""
     from flask import Flask
     from aurum_harmony.database.db import init_db
-    from aurum_harmony.database.migrate import migrate_user_fields
+    from aurum_harmony.database.migrate import run_user_fields_migration
     
     print("=" * 60)
     print("AurumHarmony Database Migration Tool")
     print("=" * 60)
     
-    # Check migration flag
-    migration_flag = Path(os.path.join(BASE_DIR, "_local", ".db_migration_completed"))
-    
-    if migration_flag.exists() and not force:
-        print("\n✅ Migrations already completed!")
-        print(f"   Flag file: {migration_flag}")
-        print("\nTo force re-run: python migrate_db.py --force")
-        return
-    
     if force:
         print("\n⚠️  Force mode: Re-running migrations")
-        if migration_flag.exists():
-            migration_flag.unlink()
     
     # Create minimal Flask app for migration
     app = Flask(__name__)
     init_db(app)
     
-    print("\n📊 Running database migrations...")
-    print("-" * 60)
-    
     try:
         with app.app_context():
-            migrate_user_fields()
-        
-        # Mark as completed
-        migration_flag.parent.mkdir(parents=True, exist_ok=True)
-        migration_flag.touch()
+            # Applied migrations are tracked in the _migrations table by the
+            # SHA-256 of the migration code, so edits re-run automatically.
+            print("\n📊 Checking database migrations...")
+            print("-" * 60)
+            ran = run_user_fields_migration(force=force)
         
         print("-" * 60)
-        print("✅ Migrations completed successfully!")
-        print(f"   Flag file created: {migration_flag}")
+        if ran:
+            print("✅ Migrations completed successfully!")
+        else:
+            print("✅ Migrations already up to date!")
+            print("\nTo force re-run: python migrate_db.py --force")
         
     except Exception as e:
         print("-" * 60)
@@ -0,0 +1,126 @@
+"""
+Shared helpers for the standalone broker/test scripts under scripts/
+
+Scripts in subdirectories put this directory on sys.path and import what
+they need from here instead of carrying their own copies. Importing it puts
+the project root on sys.path too, so scripts can import `api.*` /
+`aurum_harmony.*`, and load_env() reads the project's .env. JSON goes
+through orjson when it is installed and the stdlib json module otherwise.
+event() mirrors each step as a JSON line on stderr when AH_JSON_LOG is set.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ENV_PATH = PROJECT_ROOT / ".env"
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+# A transient 502/503/504 is retried twice with a short backoff instead of
+# failing the request; raise_on_status=False hands back the last response
+RETRY_5XX = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset(["POST"]), raise_on_status=False)
+
+# Token responses are tiny; cap reads so a large HTML error page is never
+# pulled down in full
+MAX_BODY_BYTES = 65536
+
+
+def load_env():
+    """Load the project's .env into os.environ; variables already set win."""
+    load_dotenv(ENV_PATH)
+
+
+def configure_stdout():
+    """Block-buffer stdout so progress lines go out in a few writes.
+
+    Output is flushed at exit, by input() before each prompt, and wherever
+    a script prints with flush=True (e.g. at each step header).
+    """
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
+
+def pooled_session(pool_maxsize, pool_connections=1, max_retries=0, headers=None):
+    """requests.Session keeping up to `pool_maxsize` HTTPS connections alive per host.
+
+    Size the pool to the number of concurrent requests: a smaller pool opens
+    the extra connections anyway and then discards them after use.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=pool_connections,
+                                          pool_maxsize=pool_maxsize,
+                                          max_retries=max_retries))
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def completed(fn, items):
+    """Run fn(item) for every item at once; yield (item, future) as each finishes.
+
+    Every call starts immediately (one thread per item), so breaking out of
+    the loop early does not stop the calls still in flight: closing the
+    generator waits for them, which for HTTP probes is bounded by their
+    request timeout and retries.
+    """
+    items = list(items)
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        futures = {pool.submit(fn, item): item for item in items}
+        for future in as_completed(futures):
+            yield futures[future], future
+
+
+def dumps_compact(obj) -> bytes:
+    """Serialise obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def dumps_pretty(obj) -> str:
+    """Serialise obj as indented JSON text for display."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def loads(raw: bytes):
+    """Parse a JSON response body."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def event(step: str, status: str, **fields):
+    """Write one JSON line for `step` to stderr when AH_JSON_LOG is set."""
+    if os.getenv("AH_JSON_LOG"):
+        record = {"ts": time.time_ns(), "step": step, "status": status, **fields}
+        sys.stderr.write(json.dumps(record, default=str) + "\n")
+
+
+def read_capped(response, limit=MAX_BODY_BYTES) -> bytes:
+    """First `limit` bytes of a stream=True body, then release the connection."""
+    try:
+        return response.raw.read(limit, decode_content=True) or b""
+    finally:
+        response.close()
+
+
+def preview(body: bytes, limit=200) -> str:
+    """First `limit` characters of a body for display."""
+    return body[:limit].decode("utf-8", errors="replace")
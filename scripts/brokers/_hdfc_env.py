@@ -0,0 +1,48 @@
+"""
+HDFC Sky credentials for the HDFC Sky test scripts
+
+load_hdfc_env() reads .env once per process and returns the HDFC Sky
+credentials. Importing this module puts scripts/ on sys.path, and with it
+(via _script_utils) the project root.
+"""
+
+import functools
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# scripts/ holds the helpers shared by the broker and token test scripts
+_SCRIPTS_DIR = str(Path(__file__).resolve().parents[1])
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+from _script_utils import load_env
+
+
+@dataclass(frozen=True)
+class HDFCEnv:
+    """HDFC Sky credentials as read from .env"""
+    api_key: Optional[str]
+    api_secret: Optional[str]
+    token_id: Optional[str]
+    access_token: Optional[str]
+    client_id: Optional[str]
+    email: Optional[str]
+    mobile: Optional[str]
+
+
+@functools.lru_cache(maxsize=1)
+def load_hdfc_env() -> HDFCEnv:
+    """Load .env (once) and return the HDFC Sky credentials."""
+    load_env()
+    return HDFCEnv(
+        api_key=os.getenv("HDFC_SKY_API_KEY"),
+        api_secret=os.getenv("HDFC_SKY_API_SECRET"),
+        token_id=os.getenv("HDFC_SKY_TOKEN_ID"),
+        access_token=os.getenv("HDFC_SKY_ACCESS_TOKEN"),
+        client_id=os.getenv("HDFC_SKY_CLIENT_ID"),
+        email=os.getenv("HDFC_SKY_EMAIL"),
+        mobile=os.getenv("HDFC_SKY_MOBILE"),
+    )
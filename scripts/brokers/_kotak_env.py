@@ -0,0 +1,173 @@
+"""
+Kotak Neo credentials and login session helpers for the Kotak Neo scripts
+
+load_kotak_creds() reads .env once per process and returns the Kotak Neo
+credentials. The session helpers persist a TOTP + MPIN login so later
+runs can skip it until it expires. With KOTAK_NEO_TOTP_SECRET (and pyotp)
+and KOTAK_NEO_MPIN set, the login itself runs without prompting.
+Importing this module puts scripts/ on sys.path, and with it (via
+_script_utils) the project root.
+"""
+
+import functools
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+# scripts/ holds the helpers shared by the broker and token test scripts
+_SCRIPTS_DIR = str(Path(__file__).resolve().parents[1])
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+from _script_utils import event, load_env, pooled_session
+
+try:
+    import pyotp
+except ImportError:  # pyotp is optional; without it the TOTP is typed in
+    pyotp = None
+
+SESSION_CACHE = Path.home() / ".cache" / "aurum_harmony" / "kotak_session.json"
+# A cached session this close to expiry is treated as already expired
+SESSION_MARGIN = timedelta(seconds=60)
+
+ENV_VARS = ("KOTAK_NEO_ACCESS_TOKEN", "KOTAK_NEO_MOBILE_NUMBER", "KOTAK_NEO_CLIENT_CODE")
+
+
+class MissingCredential(Exception):
+    """Raised when required Kotak Neo variables are absent from .env"""
+
+    def __init__(self, missing):
+        self.missing = tuple(missing)
+        super().__init__(f"Kotak Neo credentials not found in .env: {', '.join(self.missing)}")
+
+
+class SessionRejected(Exception):
+    """Raised when a cached session got a 401 and logging in again failed"""
+
+
+@dataclass(frozen=True)
+class KotakCreds:
+    """Kotak Neo credentials as read from .env"""
+    access_token: str
+    mobile_number: str
+    client_code: str
+    totp_secret: Optional[str] = None
+    mpin: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=1)
+def load_kotak_creds() -> KotakCreds:
+    """Load .env (once) and return the Kotak Neo credentials.
+
+    The access token is returned without any 'Bearer ' prefix. Raises
+    MissingCredential listing every variable that is not set.
+    """
+    load_env()
+    values = [os.environ.get(name) for name in ENV_VARS]
+
+    missing = [name for name, value in zip(ENV_VARS, values) if not value]
+    if missing:
+        raise MissingCredential(missing)
+    access_token, mobile_number, client_code = values
+
+    # Remove 'Bearer ' prefix if present
+    if access_token.startswith("Bearer "):
+        access_token = access_token[7:]
+
+    return KotakCreds(
+        access_token,
+        mobile_number,
+        client_code,
+        totp_secret=os.getenv("KOTAK_NEO_TOTP_SECRET") or None,
+        mpin=os.getenv("KOTAK_NEO_MPIN") or None,
+    )
+
+
+def read_totp(prompt: str) -> str:
+    """Current TOTP generated from KOTAK_NEO_TOTP_SECRET, else typed at `prompt`."""
+    secret = load_kotak_creds().totp_secret
+    if secret and pyotp is not None:
+        return pyotp.TOTP(secret).now()
+    return input(prompt).strip()
+
+
+def read_mpin(prompt: str) -> str:
+    """KOTAK_NEO_MPIN if set, else typed at `prompt`."""
+    return load_kotak_creds().mpin or input(prompt).strip()
+
+
+def make_session():
+    """Pooled session for the TOTP login, MPIN validation and data calls,
+    so they share keep-alive connections instead of a handshake each."""
+    return pooled_session(8, pool_connections=2)
+
+
+def load_cached_session(client) -> bool:
+    """Restore a saved session onto `client`; False if none, stale or another account's."""
+    try:
+        with open(SESSION_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.pop("client_code", None) != client.client_code:
+            return False
+        expiry = cached.get("token_expiry")
+        if not expiry or datetime.fromisoformat(expiry) - SESSION_MARGIN <= datetime.now():
+            return False
+        return client.restore_session(**cached)
+    except (OSError, ValueError, TypeError):
+        return False
+
+
+def save_session(client):
+    """Write the client's session tokens to SESSION_CACHE, readable by the owner only."""
+    SESSION_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    # mkstemp creates a fresh 0600 file, which then replaces the cache:
+    # rewriting an existing cache in place would keep whatever (possibly
+    # world-readable) permissions it already had
+    fd, tmp = tempfile.mkstemp(dir=SESSION_CACHE.parent, prefix=".kotak_session.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"client_code": client.client_code, **client.session_state()}, f)
+        os.replace(tmp, SESSION_CACHE)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def clear_cached_session():
+    """Forget the saved session, e.g. after the broker rejects it with a 401."""
+    try:
+        SESSION_CACHE.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def is_unauthorized(exc) -> bool:
+    """True if `exc` is an HTTP error carrying a 401 response."""
+    return getattr(getattr(exc, "response", None), "status_code", None) == 401
+
+
+def with_reauth(client, used_cache, authenticate, call):
+    """Return call(), logging in again once if the broker rejects a cached session.
+
+    Only a 401 while `used_cache` is set triggers this: the cache is cleared,
+    authenticate(client) runs the TOTP + MPIN login and call() is retried.
+    Any other error propagates. Raises SessionRejected if the login fails.
+    """
+    try:
+        return call()
+    except Exception as e:
+        if not (used_cache and is_unauthorized(e)):
+            raise
+    print("   ⚠️  Cached session rejected (401), logging in again", flush=True)
+    event("session", "rejected")
+    clear_cached_session()
+    print()
+    if not authenticate(client):
+        raise SessionRejected("cached session rejected and login failed")
+    print()
+    return call()
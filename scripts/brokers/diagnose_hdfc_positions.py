@@ -1,35 +1,143 @@
 """
 Diagnostic script to test HDFC Sky positions endpoint with detailed output
 """
-import os
+import platform
 import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-from dotenv import load_dotenv
+from _hdfc_env import load_hdfc_env
 from api.hdfc_sky_api import HDFCSkyAPI
 import requests
+from requests.adapters import HTTPAdapter
+
+# Every probe hits developer.hdfcsky.com: keep one keep-alive connection
+# so the TLS handshake is paid once instead of per request
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+# Built once per run; sent on every probe via the session
+USER_AGENT = f"Mozilla/5.0 ({platform.system()}; {platform.machine()}) Python/{platform.python_version()}"
+BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": USER_AGENT,
+}
+session.headers.update(BASE_HEADERS)
+
+# Probe responses are streamed; bodies above this size are previewed only
+MAX_JSON_BYTES = 65536
+
+def _small_json(response):
+    """Parse the body as JSON only when Content-Length says it is small."""
+    if int(response.headers.get("content-length", "99999")) >= MAX_JSON_BYTES:
+        raise ValueError("body too large to parse")
+    return response.json()
+
+def _preview(response, limit=200):
+    """First `limit` characters of the body; the rest is never downloaded."""
+    chunk = next(response.iter_content(1024, decode_unicode=True), "")
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode("utf-8", errors="replace")
+    return chunk[:limit]
+
+def _probe_endpoint(endpoint, patterns, auth_headers):
+    """Try each auth pattern against one endpoint; returns (report lines, succeeded)."""
+    lines = [
+        f"\n{'='*70}",
+        f"Testing: {endpoint}",
+        f"{'='*70}",
+    ]
+    
+    # A bodiless HEAD rules out paths that don't exist before spending
+    # four GETs on them. Anything but 404 (e.g. 405 on HEAD) falls through.
+    try:
+        probe = session.head(endpoint, timeout=5)
+        if probe.status_code == 404:
+            lines.append("\n  ⚠️  404 Not Found on HEAD (endpoint doesn't exist), skipping patterns")
+            lines.append("")
+            return lines, False
+    except Exception:
+        pass
+    
+    # Two 401s in a row means the credentials themselves are bad; the
+    # remaining patterns reuse the same material and would 401 too
+    consecutive_401 = 0
+    succeeded = False
+    
+    for pattern_name, params, use_auth in patterns:
+        if use_auth and not auth_headers:
+            continue
+        # requests drops None params, so without an api_key this pattern
+        # would repeat its token_id-only twin
+        if "api_key" in params and not params["api_key"]:
+            continue
+            
+        # Base headers live on the session; only Authorization varies
+        headers = auth_headers if use_auth else None
+        
+        lines.append(f"\n  {pattern_name}:")
+        lines.append(f"    URL: {endpoint}")
+        lines.append(f"    Params: {list(params.keys())}")
+        lines.append(f"    Headers: {[*BASE_HEADERS, *(headers or ())]}")
+        
+        response = None
+        try:
+            response = session.get(endpoint, headers=headers, params=params, timeout=10, stream=True)
+            lines.append(f"    Status: {response.status_code}")
+            consecutive_401 = consecutive_401 + 1 if response.status_code == 401 else 0
+            
+            if response.status_code == 200:
+                lines.append(f"    ✅ SUCCESS!")
+                succeeded = True
+                try:
+                    data = _small_json(response)
+                    lines.append(f"    Response keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
+                    lines.append(f"    Response preview: {str(data)[:200]}...")
+                except:
+                    lines.append(f"    Response: {_preview(response)}")
+                break  # Success! Stop trying other patterns
+            elif response.status_code == 401:
+                lines.append(f"    ❌ 401 Unauthorized")
+                try:
+                    error_data = _small_json(response)
+                    lines.append(f"    Error: {error_data}")
+                except:
+                    lines.append(f"    Error text: {_preview(response)}")
+                if consecutive_401 >= 2:
+                    lines.append("    ⏭️  Skipping remaining patterns — token appears invalid")
+                    break
+            elif response.status_code == 404:
+                lines.append(f"    ⚠️  404 Not Found (endpoint doesn't exist)")
+            else:
+                lines.append(f"    ⚠️  Status {response.status_code}")
+                lines.append(f"    Response: {_preview(response)}")
+        except Exception as e:
+            lines.append(f"    ❌ Exception: {e}")
+        finally:
+            if response is not None:
+                response.close()
+    
+    lines.append("")
+    return lines, succeeded
 
-load_dotenv(project_root / ".env")
+def diagnose_positions(client=None):
+    """Test positions endpoint with detailed diagnostics
 
-def diagnose_positions():
-    """Test positions endpoint with detailed diagnostics"""
+    Reads credentials from an existing client if given, else from .env.
+    Returns True if any endpoint/pattern combination succeeded.
+    """
     print("=" * 70)
     print("HDFC Sky Positions Endpoint Diagnostic")
     print("=" * 70)
     print()
     
     # Load credentials
-    api_key = os.getenv("HDFC_SKY_API_KEY")
-    api_secret = os.getenv("HDFC_SKY_API_SECRET")
-    token_id = os.getenv("HDFC_SKY_TOKEN_ID")
-    access_token = os.getenv("HDFC_SKY_ACCESS_TOKEN")
+    creds = client if client is not None else load_hdfc_env()
+    api_key, token_id, access_token = creds.api_key, creds.token_id, creds.access_token
     
     if not token_id:
         print("❌ HDFC_SKY_TOKEN_ID not found in .env")
-        return
+        return False
     
     print(f"✅ Token ID: {token_id[:30]}...")
     if access_token:
@@ -51,64 +159,27 @@ def diagnose_positions():
         ("Pattern 4: api_key + token_id + Authorization", {"api_key": api_key, "token_id": token_id}, True),
     ]
     
-    import platform
-    user_agent = f"Mozilla/5.0 ({platform.system()}; {platform.machine()}) Python/{platform.python_version()}"
+    auth_headers = None
+    if access_token:
+        auth_header = access_token
+        if not auth_header.startswith("Bearer "):
+            auth_header = f"Bearer {auth_header}"
+        auth_headers = {"Authorization": auth_header}
     
-    for endpoint in endpoints:
-        print(f"\n{'='*70}")
-        print(f"Testing: {endpoint}")
-        print(f"{'='*70}")
-        
-        for pattern_name, params, use_auth in patterns:
-            if use_auth and not access_token:
-                continue
-                
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "User-Agent": user_agent,
-            }
-            
-            if use_auth:
-                auth_header = access_token
-                if not auth_header.startswith("Bearer "):
-                    auth_header = f"Bearer {auth_header}"
-                headers["Authorization"] = auth_header
-            
-            print(f"\n  {pattern_name}:")
-            print(f"    URL: {endpoint}")
-            print(f"    Params: {list(params.keys())}")
-            print(f"    Headers: {list(headers.keys())}")
-            
-            try:
-                response = requests.get(endpoint, headers=headers, params=params, timeout=10)
-                print(f"    Status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    print(f"    ✅ SUCCESS!")
-                    try:
-                        data = response.json()
-                        print(f"    Response keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-                        print(f"    Response preview: {str(data)[:200]}...")
-                    except:
-                        print(f"    Response: {response.text[:200]}")
-                    break  # Success! Stop trying other patterns
-                elif response.status_code == 401:
-                    print(f"    ❌ 401 Unauthorized")
-                    try:
-                        error_data = response.json()
-                        print(f"    Error: {error_data}")
-                    except:
-                        print(f"    Error text: {response.text[:200]}")
-                elif response.status_code == 404:
-                    print(f"    ⚠️  404 Not Found (endpoint doesn't exist)")
-                else:
-                    print(f"    ⚠️  Status {response.status_code}")
-                    print(f"    Response: {response.text[:200]}")
-            except Exception as e:
-                print(f"    ❌ Exception: {e}")
-        
-        print()
+    # Endpoints are probed concurrently (pure I/O); patterns within an
+    # endpoint stay sequential so the first 200 still stops that endpoint.
+    # Each worker returns its output lines and whether a pattern succeeded,
+    # so the report prints in order.
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+        reports = pool.map(
+            lambda endpoint: _probe_endpoint(endpoint, patterns, auth_headers),
+            endpoints,
+        )
+        succeeded = False
+        for lines, ok in reports:
+            # One write per endpoint block instead of a print per line
+            sys.stdout.write("\n".join(lines) + "\n")
+            succeeded = succeeded or ok
     
     print("\n" + "=" * 70)
     print("💡 Next Steps:")
@@ -118,6 +189,13 @@ def diagnose_positions():
     print("3. Check browser Network tab when viewing positions on HDFC Sky portal")
     print("4. Look for API calls to positions-related endpoints")
     print()
+    
+    return succeeded
+
+def run(client):
+    """Run the positions diagnostic with an existing client; returns (name, ok, message)."""
+    ok = diagnose_positions(client)
+    return "positions_diagnostic", ok, "A positions endpoint responded" if ok else "No positions endpoint responded"
 
 if __name__ == "__main__":
     diagnose_positions()
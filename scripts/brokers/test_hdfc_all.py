@@ -0,0 +1,83 @@
+"""
+Run every HDFC Sky test script in one process
+
+Loads .env and builds the HDFCSkyAPI client once, then calls each
+script's run(client) in turn and prints a pass/fail summary.
+"""
+
+import sys
+
+# Also puts scripts/ and the project root on sys.path
+from _hdfc_env import load_hdfc_env
+from _script_utils import ENV_PATH
+from api.hdfc_sky_api import HDFCSkyAPI
+import requests
+from requests.adapters import HTTPAdapter
+
+import test_hdfc_connection
+import test_hdfc_holdings
+import test_hdfc_quotes
+import test_hdfc_other_endpoints
+import diagnose_hdfc_positions
+import test_hdfc_integration
+import test_hdfc_paper_trading
+
+# Connection runs first: it performs the OTP/PIN login if no token is set
+TESTS = [
+    test_hdfc_connection,
+    test_hdfc_holdings,
+    test_hdfc_quotes,
+    test_hdfc_other_endpoints,
+    diagnose_hdfc_positions,
+    test_hdfc_integration,
+    test_hdfc_paper_trading,
+]
+
+
+def main():
+    if not ENV_PATH.exists():
+        print("❌ ERROR: .env file not found!")
+        print(f"   Expected location: {ENV_PATH}")
+        return 1
+    env = load_hdfc_env()
+
+    # One pooled session for every client call across all scenarios, so
+    # back-to-back calls (e.g. the paper BUY then SELL) skip the handshake
+    shared_session = requests.Session()
+    shared_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+    client = HDFCSkyAPI(
+        api_key=env.api_key,
+        api_secret=env.api_secret,
+        token_id=env.token_id,
+        client_id=env.client_id,
+        email=env.email,
+        mobile=env.mobile,
+        access_token=env.access_token,
+        session=shared_session,
+    )
+
+    results = []
+    for mod in TESTS:
+        try:
+            results.append(mod.run(client))
+        except Exception as e:
+            results.append((mod.__name__, False, f"Unexpected error: {e}"))
+        print()
+
+    print("=" * 70)
+    print("HDFC Sky Test Summary")
+    print("=" * 70)
+    for name, ok, message in results:
+        print(f"   {'✅' if ok else '❌'} {name}: {message}")
+    print()
+
+    return 0 if all(ok for _, ok, _ in results) else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Test cancelled by user")
+        sys.exit(1)
@@ -4,34 +4,38 @@ HDFC Sky Connection Test Script
 Tests the HDFC Sky API connection with Client ID + OTP + PIN authentication.
 """
 
-import os
+import getpass
 import sys
-from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-from dotenv import load_dotenv
+# Also puts scripts/ and the project root on sys.path
+from _hdfc_env import load_hdfc_env
+from _script_utils import ENV_PATH
 from api.hdfc_sky_api import HDFCSkyAPI
 
-# Load environment variables
-env_path = project_root / ".env"
-if env_path.exists():
-    load_dotenv(env_path)
-else:
-    print("❌ ERROR: .env file not found!")
-    print(f"   Expected location: {env_path}")
-    sys.exit(1)
+# Every valid OTP/PIN; a set lookup also rejects non-ASCII digits like "١٢٣٤"
+_FOUR_DIGITS = frozenset(f"{i:04d}" for i in range(10000))
+
+
+def prompt_four_digits(label, prompt, hidden=False, attempts=3):
+    """Ask for a 4-digit code, re-prompting on typos; None once attempts run out.
+
+    Re-asking locally avoids restarting login, which would re-send the OTP.
+    """
+    read = getpass.getpass if hidden else input
+    for attempt in range(attempts, 0, -1):
+        value = read(prompt).strip()
+        if value in _FOUR_DIGITS:
+            return value
+        if attempt > 1:
+            print(f"   ⚠️  Invalid {label} format (must be 4 digits), {attempt - 1} attempt(s) left")
+    return None
 
 
 def get_credentials():
     """Load credentials from environment variables."""
-    api_key = os.getenv("HDFC_SKY_API_KEY")
-    api_secret = os.getenv("HDFC_SKY_API_SECRET")
-    client_id = os.getenv("HDFC_SKY_CLIENT_ID")
-    email = os.getenv("HDFC_SKY_EMAIL")
-    mobile = os.getenv("HDFC_SKY_MOBILE")
+    env = load_hdfc_env()
+    api_key, api_secret = env.api_key, env.api_secret
+    client_id, email, mobile = env.client_id, env.email, env.mobile
     
     if not api_key:
         print("❌ ERROR: HDFC_SKY_API_KEY not found in .env")
@@ -44,59 +48,77 @@ def get_credentials():
     return api_key, api_secret, client_id, email, mobile
 
 
-def test_connection():
-    """Test HDFC Sky API connection."""
+def mask_email_domain(email):
+    """Domain part of an email for masked display, '***' if there is none."""
+    _, at, domain = (email or "").partition("@")
+    return domain if at and domain else "***"
+
+
+def test_connection(client=None):
+    """Test HDFC Sky API connection.
+
+    Builds its own client from .env unless one is passed in.
+    """
     print("=" * 60)
     print("HDFC Sky API Connection Test")
     print("=" * 60)
     print()
     
-    # Load credentials
-    print("📋 Step 1: Loading credentials from .env...")
-    try:
-        api_key, api_secret, client_id, email, mobile = get_credentials()
-        token_id = os.getenv("HDFC_SKY_TOKEN_ID")  # Get token_id from URL params
-        access_token = os.getenv("HDFC_SKY_ACCESS_TOKEN")  # Get JWT token from localStorage
-        print(f"   ✅ API Key: {api_key[:20]}...")
-        print(f"   ✅ API Secret: {api_secret[:20]}...")
-        if token_id:
-            print(f"   ✅ Token ID: {token_id[:20]}...")
-        if access_token:
-            print(f"   ✅ Access Token (JWT): {access_token[:30]}...")
-        if client_id:
-            print(f"   ✅ Client ID: {client_id}")
-        if email:
-            print(f"   ✅ Email: {email[:5]}***@{email.split('@')[1] if '@' in email else '***'}")
-        if mobile:
-            print(f"   ✅ Mobile: {mobile[:2]}****{mobile[-2:] if len(mobile) > 4 else '**'}")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return False
+    if client is None:
+        # Load credentials
+        print("📋 Step 1: Loading credentials from .env...")
+        try:
+            api_key, api_secret, client_id, email, mobile = get_credentials()
+            env = load_hdfc_env()
+            token_id = env.token_id  # Get token_id from URL params
+            access_token = env.access_token  # Get JWT token from localStorage
+            print(f"   ✅ API Key: {api_key[:20]}...")
+            print(f"   ✅ API Secret: {api_secret[:20]}...")
+            if token_id:
+                print(f"   ✅ Token ID: {token_id[:20]}...")
+            if access_token:
+                print(f"   ✅ Access Token (JWT): {access_token[:30]}...")
+            if client_id:
+                print(f"   ✅ Client ID: {client_id}")
+            if email:
+                print(f"   ✅ Email: {email[:5]}***@{mask_email_domain(email)}")
+            if mobile:
+                print(f"   ✅ Mobile: {mobile[:2]}****{mobile[-2:] if len(mobile) > 4 else '**'}")
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            return False
     
-    print()
+        print()
     
-    # Initialize client
-    print("📋 Step 2: Initializing HDFC Sky API client...")
-    try:
-        client = HDFCSkyAPI(
-            api_key=api_key,
-            api_secret=api_secret,
-            token_id=token_id,  # token_id from URL params (optional if we have access_token)
-            client_id=client_id,
-            email=email,
-            mobile=mobile,
-            access_token=access_token  # JWT token from localStorage (optional if we have token_id)
-        )
-        print("   ✅ Client initialized")
-        if access_token:
-            print("   ✅ Using stored JWT token (from localStorage.accessToken)")
-        if token_id:
-            print("   ✅ Using token_id (from URL params)")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return False
+        # Initialize client
+        print("📋 Step 2: Initializing HDFC Sky API client...")
+        try:
+            client = HDFCSkyAPI(
+                api_key=api_key,
+                api_secret=api_secret,
+                token_id=token_id,  # token_id from URL params (optional if we have access_token)
+                client_id=client_id,
+                email=email,
+                mobile=mobile,
+                access_token=access_token  # JWT token from localStorage (optional if we have token_id)
+            )
+            print("   ✅ Client initialized")
+            if access_token:
+                print("   ✅ Using stored JWT token (from localStorage.accessToken)")
+            if token_id:
+                print("   ✅ Using token_id (from URL params)")
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            return False
     
-    print()
+        print()
+    else:
+        print("📋 Step 1-2: Using shared HDFC Sky API client")
+        print()
+    
+    token_id, access_token = client.token_id, client.access_token
+    client_id, email, mobile = client.client_id, client.email, client.mobile
+    email_domain = mask_email_domain(email)
     
     # Check if we have authentication (either token_id or access_token)
     if client.is_authenticated():
@@ -138,7 +160,7 @@ def test_connection():
             result = client.send_otp(identifier)
             print("   ✅ OTP sent to your registered mobile and email!")
             print(f"   📱 Check mobile ending in: {mobile[-4:] if mobile else '****'}")
-            print(f"   📧 Check email: {email[:3]}***@{email.split('@')[1] if email and '@' in email else '***'}")
+            print(f"   📧 Check email: {(email or '')[:3]}***@{email_domain}")
         except Exception as e:
             print(f"   ❌ Error sending OTP: {e}")
             return False
@@ -147,9 +169,9 @@ def test_connection():
         
         # Step 2: Enter OTP
         print("   Step 3.2: Enter 4-digit OTP...")
-        otp = input("   OTP (4 digits): ").strip()
+        otp = prompt_four_digits("OTP", "   OTP (4 digits): ")
         
-        if not otp or len(otp) != 4 or not otp.isdigit():
+        if otp is None:
             print("   ❌ Invalid OTP format (must be 4 digits)")
             return False
         
@@ -164,10 +186,9 @@ def test_connection():
         
         # Step 3: Enter PIN
         print("   Step 3.3: Enter 4-digit PIN...")
-        import getpass
-        pin = getpass.getpass("   PIN (4 digits, hidden): ").strip()
+        pin = prompt_four_digits("PIN", "   PIN (4 digits, hidden): ", hidden=True)
         
-        if not pin or len(pin) != 4 or not pin.isdigit():
+        if pin is None:
             print("   ❌ Invalid PIN format (must be 4 digits)")
             return False
         
@@ -220,7 +241,18 @@ def test_connection():
     return True
 
 
+def run(client):
+    """Run the connection test with an existing client; returns (name, ok, message)."""
+    ok = test_connection(client)
+    return "connection", ok, "Connection test passed" if ok else "Connection test failed"
+
+
 if __name__ == "__main__":
+    if not ENV_PATH.exists():
+        print("❌ ERROR: .env file not found!")
+        print(f"   Expected location: {ENV_PATH}")
+        sys.exit(1)
+    
     try:
         success = test_connection()
         sys.exit(0 if success else 1)
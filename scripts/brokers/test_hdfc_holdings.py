@@ -1,28 +1,22 @@
 """Quick test for HDFC Sky holdings endpoint"""
-import os
-import sys
-from pathlib import Path
-
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-from dotenv import load_dotenv
+from _hdfc_env import load_hdfc_env
 from api.hdfc_sky_api import HDFCSkyAPI
 
-load_dotenv(project_root / ".env")
-
-api_key = os.getenv("HDFC_SKY_API_KEY")
-api_secret = os.getenv("HDFC_SKY_API_SECRET")
-token_id = os.getenv("HDFC_SKY_TOKEN_ID")
-access_token = os.getenv("HDFC_SKY_ACCESS_TOKEN")
 
-client = HDFCSkyAPI(api_key, api_secret, token_id=token_id, access_token=access_token)
+def run(client):
+    """Fetch holdings with an existing client; returns (name, ok, message)."""
+    print("Testing holdings endpoint...")
+    try:
+        holdings = client.get_holdings()
+        print("✅ Holdings endpoint works!")
+        print(f"Response: {holdings}")
+        return "holdings", True, "Holdings endpoint works"
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return "holdings", False, str(e)
 
-print("Testing holdings endpoint...")
-try:
-    holdings = client.get_holdings()
-    print("✅ Holdings endpoint works!")
-    print(f"Response: {holdings}")
-except Exception as e:
-    print(f"❌ Error: {e}")
 
+if __name__ == "__main__":
+    env = load_hdfc_env()
+    client = HDFCSkyAPI(env.api_key, env.api_secret, token_id=env.token_id, access_token=env.access_token)
+    run(client)
@@ -1,28 +1,13 @@
 """Test HDFC Sky endpoints that don't require positions"""
-import os
+import platform
 import sys
-from pathlib import Path
-
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+from concurrent.futures import ThreadPoolExecutor
 
-from dotenv import load_dotenv
+from _hdfc_env import load_hdfc_env
 from api.hdfc_sky_api import HDFCSkyAPI
 import requests
-
-load_dotenv(project_root / ".env")
-
-api_key = os.getenv("HDFC_SKY_API_KEY")
-api_secret = os.getenv("HDFC_SKY_API_SECRET")
-token_id = os.getenv("HDFC_SKY_TOKEN_ID")
-access_token = os.getenv("HDFC_SKY_ACCESS_TOKEN")
-
-print("=" * 70)
-print("Testing HDFC Sky Endpoints (Non-Positions)")
-print("=" * 70)
-print()
-
-client = HDFCSkyAPI(api_key, api_secret, token_id=token_id, access_token=access_token)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Test endpoints that should work even without positions
 endpoints_to_test = [
@@ -31,80 +16,137 @@ endpoints_to_test = [
     ("Quotes (NIFTY)", "/oapi/v1/quotes", "GET", {"symbol": "NIFTY", "exchange": "NSE"}),
 ]
 
-import platform
-user_agent = f"Mozilla/5.0 ({platform.system()}; {platform.machine()}) Python/{platform.python_version()}"
+# Resolved once per process; platform.machine() may shell out to uname
+USER_AGENT = f"Mozilla/5.0 ({platform.system()}; {platform.machine()}) Python/{platform.python_version()}"
 
-for name, endpoint, method, *extra in endpoints_to_test:
-    print(f"\n{'='*70}")
-    print(f"Testing: {name} ({endpoint})")
-    print(f"{'='*70}")
-    
-    url = f"https://developer.hdfcsky.com{endpoint}"
+# Keep-alive connections to developer.hdfcsky.com shared by every probe;
+# pool_maxsize covers all endpoint x pattern probes running at once.
+# Transient 429/5xx are retried with 0.5s/1s/2s backoff; the final
+# response is still returned (raise_on_status=False) so it gets printed.
+retry = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET", "POST"),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+session = requests.Session()
+session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=6))
+session.headers.update({"Content-Type": "application/json", "User-Agent": USER_AGENT})
+
+
+def _probe_pattern(pattern, url, method, extra, token_id, access_token):
+    """Call one endpoint with one auth pattern; returns (report lines, succeeded)."""
+    lines = []
     
-    # Try JWT Authorization pattern (like /oapi/v1/fetch-apps)
-    if access_token:
-        try:
+    try:
+        if pattern == "jwt":
+            # Try JWT Authorization pattern (like /oapi/v1/fetch-apps)
             headers = {
-                "Content-Type": "application/json",
                 "Accept": "application/json, text/plain, */*",
-                "User-Agent": user_agent,
                 "Authorization": access_token,  # JWT directly, no Bearer prefix
             }
             
             if method == "GET":
                 params = extra[0] if extra else {}
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = session.get(url, headers=headers, params=params, timeout=10)
             else:
                 data = extra[0] if extra else {}
-                response = requests.post(url, headers=headers, json=data, timeout=10)
+                response = session.post(url, headers=headers, json=data, timeout=10)
             
             if response.status_code == 200:
-                print(f"✅ SUCCESS with JWT Authorization pattern!")
+                lines.append(f"✅ SUCCESS with JWT Authorization pattern!")
                 try:
                     result = response.json()
-                    print(f"   Response keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
-                    print(f"   Response preview: {str(result)[:200]}...")
+                    lines.append(f"   Response keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
+                    lines.append(f"   Response preview: {str(result)[:200]}...")
                 except:
-                    print(f"   Response: {response.text[:200]}")
-            else:
-                print(f"   Status: {response.status_code}")
-                print(f"   Response: {response.text[:200]}")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-    
-    # Try Dashboard_API_CALL pattern (only token_id in params)
-    if token_id:
-        try:
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "User-Agent": user_agent,
-            }
+                    lines.append(f"   Response: {response.text[:200]}")
+                return lines, True
+            lines.append(f"   Status: {response.status_code}")
+            lines.append(f"   Response: {response.text[:200]}")
+        else:
+            # Try Dashboard_API_CALL pattern (only token_id in params)
+            headers = {"Accept": "application/json"}
             params = {"token_id": token_id}
             if extra:
                 params.update(extra[0])
             
             if method == "GET":
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = session.get(url, headers=headers, params=params, timeout=10)
             else:
-                response = requests.post(url, headers=headers, params=params, json={}, timeout=10)
+                response = session.post(url, headers=headers, params=params, json={}, timeout=10)
             
             if response.status_code == 200:
-                print(f"✅ SUCCESS with Dashboard_API_CALL pattern!")
+                lines.append(f"✅ SUCCESS with Dashboard_API_CALL pattern!")
                 try:
                     result = response.json()
-                    print(f"   Response keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
+                    lines.append(f"   Response keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
                 except:
-                    print(f"   Response: {response.text[:200]}")
-            else:
-                print(f"   Status: {response.status_code}")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
+                    lines.append(f"   Response: {response.text[:200]}")
+                return lines, True
+            lines.append(f"   Status: {response.status_code}")
+    except Exception as e:
+        lines.append(f"   ❌ Error: {e}")
+    
+    return lines, False
+
 
-print("\n" + "=" * 70)
-print("💡 Summary:")
-print("=" * 70)
-print("If any endpoint works, authentication is correct!")
-print("Positions endpoint will work once account is funded and has positions.")
-print()
+def run(client):
+    """Probe the non-positions endpoints with an existing client; returns (name, ok, message)."""
+    token_id = client.token_id
+    access_token = client.access_token
+    
+    print("=" * 70)
+    print("Testing HDFC Sky Endpoints (Non-Positions)")
+    print("=" * 70)
+    print()
+    
+    patterns = [p for p, cred in (("jwt", access_token), ("dashboard", token_id)) if cred]
+    probes = [
+        (name, endpoint, pattern, method, extra)
+        for name, endpoint, method, *extra in endpoints_to_test
+        for pattern in patterns
+    ]
+    
+    # Every endpoint x pattern is independent I/O: run them all at once
+    # over the shared session, then print in declaration order
+    with ThreadPoolExecutor(max_workers=max(len(probes), 1)) as pool:
+        results = list(pool.map(
+            lambda probe: _probe_pattern(
+                probe[2], f"https://developer.hdfcsky.com{probe[1]}", probe[3], probe[4],
+                token_id, access_token,
+            ),
+            probes,
+        ))
+    
+    # Assemble the whole report and write it to stdout in one call
+    # rather than a print (lock + flush on a TTY) per line
+    successes = 0
+    last_endpoint = None
+    report = []
+    for (name, endpoint, *_), (lines, ok) in zip(probes, results):
+        if endpoint != last_endpoint:
+            report += [f"\n{'='*70}", f"Testing: {name} ({endpoint})", f"{'='*70}"]
+            last_endpoint = endpoint
+        report += lines
+        successes += ok
+    if report:
+        sys.stdout.write("\n".join(report) + "\n")
+    
+    print("\n" + "=" * 70)
+    print("💡 Summary:")
+    print("=" * 70)
+    print("If any endpoint works, authentication is correct!")
+    print("Positions endpoint will work once account is funded and has positions.")
+    print()
+    
+    if successes:
+        return "other_endpoints", True, f"{successes} endpoint/pattern combinations returned 200"
+    return "other_endpoints", False, "No endpoint returned 200"
 
+if __name__ == "__main__":
+    env = load_hdfc_env()
+    client = HDFCSkyAPI(env.api_key, env.api_secret, token_id=env.token_id, access_token=env.access_token, session=session)
+    run(client)
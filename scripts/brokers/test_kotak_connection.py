@@ -5,117 +5,103 @@ Tests the Kotak Neo API connection step-by-step.
 This script will guide you through the authentication process.
 """
 
-import os
+import re
 import sys
-from pathlib import Path
+import time
+from operator import length_hint
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-from dotenv import load_dotenv
+# Also puts scripts/ and the project root on sys.path
+from _kotak_env import (
+    MissingCredential,
+    SessionRejected,
+    load_cached_session,
+    load_kotak_creds,
+    make_session,
+    read_mpin,
+    read_totp,
+    save_session,
+    with_reauth,
+)
+from _script_utils import ENV_PATH, configure_stdout, event
 from api.kotak_neo import KotakNeoAPI
 
-# Load environment variables
-env_path = project_root / ".env"
-if env_path.exists():
-    load_dotenv(env_path)
-else:
-    print("❌ ERROR: .env file not found!")
-    print(f"   Expected location: {env_path}")
-    print("\n   Please create a .env file with:")
-    print("   KOTAK_NEO_ACCESS_TOKEN=your_token")
-    print("   KOTAK_NEO_MOBILE_NUMBER=+91XXXXXXXXXX")
-    print("   KOTAK_NEO_CLIENT_CODE=YOUR_CODE")
+# TOTP and MPIN are both exactly six ASCII digits ([0-9], not \d, which
+# would also accept non-ASCII digits like "١٢٣٤٥٦")
+_SIX_DIGITS = re.compile(r"[0-9]{6}")
+
+_BAR = "=" * 60
+
+ENV_HELP = (
+    "❌ ERROR: .env file not found!",
+    f"   Expected location: {ENV_PATH}",
+    "\n   Please create a .env file with:",
+    "   KOTAK_NEO_ACCESS_TOKEN=your_token",
+    "   KOTAK_NEO_MOBILE_NUMBER=+91XXXXXXXXXX",
+    "   KOTAK_NEO_CLIENT_CODE=YOUR_CODE",
+)
+TOTP_HELP = (
+    "   📱 Open your authenticator app (Google/Microsoft Authenticator)",
+    "   🔢 Enter the 6-digit TOTP code (changes every 30 seconds)",
+    "",
+)
+MPIN_HELP = (
+    "   🔐 Enter your 6-digit MPIN (trading PIN)",
+    "   ⚠️  This is your trading PIN, NOT your login password",
+    "",
+)
+
+configure_stdout()
+shared_session = make_session()
+
+if not ENV_PATH.exists():
+    print("\n".join(ENV_HELP))
     sys.exit(1)
 
 
 def get_credentials():
     """Load credentials from environment variables."""
-    access_token = os.getenv("KOTAK_NEO_ACCESS_TOKEN")
-    mobile_number = os.getenv("KOTAK_NEO_MOBILE_NUMBER")
-    client_code = os.getenv("KOTAK_NEO_CLIENT_CODE")
-    
-    if not access_token:
-        print("❌ ERROR: KOTAK_NEO_ACCESS_TOKEN not found in .env")
-        sys.exit(1)
-    
-    if not mobile_number:
-        print("❌ ERROR: KOTAK_NEO_MOBILE_NUMBER not found in .env")
-        sys.exit(1)
-    
-    if not client_code:
-        print("❌ ERROR: KOTAK_NEO_CLIENT_CODE not found in .env")
+    try:
+        creds = load_kotak_creds()
+    except MissingCredential as e:
+        for name in e.missing:
+            print(f"❌ ERROR: {name} not found in .env")
         sys.exit(1)
     
-    # Remove 'Bearer ' prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-    
-    return access_token, mobile_number, client_code
+    return creds.access_token, creds.mobile_number, creds.client_code
 
 
-def test_connection():
-    """Test Kotak Neo API connection."""
-    print("=" * 60)
-    print("Kotak Neo API Connection Test")
-    print("=" * 60)
-    print()
-    
-    # Load credentials
-    print("📋 Step 1: Loading credentials from .env...")
-    try:
-        access_token, mobile_number, client_code = get_credentials()
-        print(f"   ✅ Access Token: {access_token[:20]}...")
-        print(f"   ✅ Mobile Number: {mobile_number}")
-        print(f"   ✅ Client Code: {client_code}")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return False
-    
-    print()
-    
-    # Initialize client
-    print("📋 Step 2: Initializing Kotak Neo API client...")
-    try:
-        client = KotakNeoAPI(
-            access_token=access_token,
-            mobile_number=mobile_number,
-            client_code=client_code
-        )
-        print("   ✅ Client initialized")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return False
-    
-    print()
-    
+def authenticate(client):
+    """Interactive TOTP + MPIN login; caches the session on success."""
     # Step 1: TOTP Login
-    print("📋 Step 3: TOTP Login")
-    print("   📱 Open your authenticator app (Google/Microsoft Authenticator)")
-    print("   🔢 Enter the 6-digit TOTP code (changes every 30 seconds)")
-    print()
+    print("📋 Step 3: TOTP Login", flush=True)
+    print("\n".join(TOTP_HELP))
     
-    totp = input("   Enter TOTP code: ").strip()
+    totp = read_totp("   Enter TOTP code: ")
     
-    if len(totp) != 6 or not totp.isdigit():
+    if not _SIX_DIGITS.fullmatch(totp):
         print("   ❌ Invalid TOTP format. Must be 6 digits.")
+        event("totp_login", "fail", error="invalid format")
         return False
     
     try:
         print("   🔄 Sending TOTP login request...")
+        started = time.perf_counter()
         result = client.login_with_totp(totp)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
         
         if result and "token" in result:
             print("   ✅ TOTP Login Successful!")
+            event("totp_login", "ok", latency_ms=latency_ms)
             print(f"   📝 View Token: {result.get('token', '')[:30]}...")
             print(f"   📝 Session ID: {result.get('sid', '')[:20]}...")
         else:
             print("   ❌ TOTP Login Failed!")
             print(f"   Response: {result}")
+            event("totp_login", "fail", latency_ms=latency_ms)
             return False
     except Exception as e:
         print(f"   ❌ Error during TOTP login: {e}")
+        event("totp_login", "error", error=str(e))
         if hasattr(e, 'response') and e.response is not None:
             try:
                 error_data = e.response.json()
@@ -127,32 +113,36 @@ def test_connection():
     print()
     
     # Step 2: MPIN Validation
-    print("📋 Step 4: MPIN Validation")
-    print("   🔐 Enter your 6-digit MPIN (trading PIN)")
-    print("   ⚠️  This is your trading PIN, NOT your login password")
-    print()
+    print("📋 Step 4: MPIN Validation", flush=True)
+    print("\n".join(MPIN_HELP))
     
-    mpin = input("   Enter MPIN: ").strip()
+    mpin = read_mpin("   Enter MPIN: ")
     
-    if len(mpin) != 6 or not mpin.isdigit():
+    if not _SIX_DIGITS.fullmatch(mpin):
         print("   ❌ Invalid MPIN format. Must be 6 digits.")
+        event("mpin", "fail", error="invalid format")
         return False
     
     try:
         print("   🔄 Validating MPIN...")
+        started = time.perf_counter()
         result = client.validate_mpin(mpin)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
         
         if result and "token" in result:
             print("   ✅ MPIN Validation Successful!")
+            event("mpin", "ok", latency_ms=latency_ms)
             print(f"   📝 Trade Token: {result.get('token', '')[:30]}...")
             print(f"   📝 Session ID: {result.get('sid', '')[:20]}...")
             print(f"   📝 Base URL: {result.get('baseUrl', '')}")
         else:
             print("   ❌ MPIN Validation Failed!")
             print(f"   Response: {result}")
+            event("mpin", "fail", latency_ms=latency_ms)
             return False
     except Exception as e:
         print(f"   ❌ Error during MPIN validation: {e}")
+        event("mpin", "error", error=str(e))
         if hasattr(e, 'response') and e.response is not None:
             try:
                 error_data = e.response.json()
@@ -161,22 +151,84 @@ def test_connection():
                 print(f"   Status code: {e.response.status_code}")
         return False
     
+    save_session(client)
+    return True
+
+
+def test_connection():
+    """Test Kotak Neo API connection."""
+    print(_BAR)
+    print("Kotak Neo API Connection Test")
+    print(_BAR)
+    print()
+    
+    # Load credentials
+    print("📋 Step 1: Loading credentials from .env...", flush=True)
+    try:
+        access_token, mobile_number, client_code = get_credentials()
+        print(f"   ✅ Access Token: {access_token[:20]}...")
+        print(f"   ✅ Mobile Number: {mobile_number}")
+        print(f"   ✅ Client Code: {client_code}")
+        event("credentials", "ok")
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        event("credentials", "error", error=str(e))
+        return False
+    
+    print()
+    
+    # Initialize client
+    print("📋 Step 2: Initializing Kotak Neo API client...", flush=True)
+    try:
+        client = KotakNeoAPI(
+            access_token=access_token,
+            mobile_number=mobile_number,
+            client_code=client_code,
+            session=shared_session,
+        )
+        print("   ✅ Client initialized")
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+    
+    print()
+    
+    # Steps 3-4: reuse the last TOTP + MPIN login while it is still valid
+    used_cache = load_cached_session(client)
+    if used_cache:
+        print("📋 Step 3-4: Reusing cached Kotak Neo session (TOTP/MPIN skipped)", flush=True)
+        print(f"   📝 Expires: {client.token_expiry:%Y-%m-%d %H:%M}")
+        event("session", "cached", expires=client.token_expiry)
+    elif not authenticate(client):
+        return False
+    
     print()
     
     # Step 3: Test API Call (Get Positions)
-    print("📋 Step 5: Testing API Call (Get Positions)...")
+    print("📋 Step 5: Testing API Call (Get Positions)...", flush=True)
+    started = time.perf_counter()
     try:
-        positions = client.get_positions()
+        # A cached session the broker no longer accepts: log in afresh once
+        positions = with_reauth(client, used_cache, authenticate, client.get_positions)
         print("   ✅ API Call Successful!")
-        print(f"   📊 Positions retrieved: {len(positions) if isinstance(positions, list) else 'N/A'}")
+        # The API wraps the rows as {"stat": ..., "data": [...]}; length_hint
+        # also covers any sized sequence and gives -1 when there is none
+        rows = positions.get("data") if isinstance(positions, dict) else positions
+        count = length_hint(rows, -1)
+        print(f"   📊 Positions retrieved: {count if count >= 0 else 'N/A'}")
+        event("positions", "ok", count=count if count >= 0 else None,
+              latency_ms=round((time.perf_counter() - started) * 1000, 1))
+    except SessionRejected:
+        return False
     except Exception as e:
         print(f"   ⚠️  API call test failed (this is okay if you have no positions): {e}")
+        event("positions", "warn", error=str(e))
         # Don't fail the test for this
     
     print()
-    print("=" * 60)
+    print(_BAR)
     print("✅ CONNECTION TEST PASSED!")
-    print("=" * 60)
+    print(_BAR)
     print()
     print("Your Kotak Neo API is now configured and ready to use!")
     print()
@@ -192,6 +244,7 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print(f"\n\n❌ Unexpected error: {e}")
+        sys.stdout.flush()
         import traceback
         traceback.print_exc()
         sys.exit(1)
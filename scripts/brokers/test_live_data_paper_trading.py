@@ -5,95 +5,129 @@ Tests the live data paper trading adapter with Kotak Neo API.
 This uses real market data but executes trades in paper mode.
 """
 
-import os
 import sys
-from pathlib import Path
+import time
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-from dotenv import load_dotenv
+# Also puts scripts/ and the project root on sys.path
+from _kotak_env import (
+    MissingCredential,
+    SessionRejected,
+    load_cached_session,
+    load_kotak_creds,
+    make_session,
+    read_mpin,
+    read_totp,
+    save_session,
+    with_reauth,
+)
+from _script_utils import ENV_PATH, configure_stdout, event
 from api.kotak_neo import KotakNeoAPI
-from aurum_harmony.engines.trade_execution.live_data_paper_adapter import LiveDataPaperAdapter
-from aurum_harmony.engines.trade_execution.trade_execution import Order, OrderSide, OrderType
 
-# Load environment variables
-env_path = project_root / ".env"
-if env_path.exists():
-    load_dotenv(env_path)
-else:
+_BAR = "=" * 60
+
+configure_stdout()
+shared_session = make_session()
+
+if not ENV_PATH.exists():
     print("❌ ERROR: .env file not found!")
     sys.exit(1)
 
 
 def get_credentials():
     """Load credentials from environment variables."""
-    access_token = os.getenv("KOTAK_NEO_ACCESS_TOKEN")
-    mobile_number = os.getenv("KOTAK_NEO_MOBILE_NUMBER")
-    client_code = os.getenv("KOTAK_NEO_CLIENT_CODE")
-    
-    if not all([access_token, mobile_number, client_code]):
+    try:
+        creds = load_kotak_creds()
+    except MissingCredential as e:
         print("❌ ERROR: Kotak Neo credentials not found in .env")
-        print("   Required: KOTAK_NEO_ACCESS_TOKEN, KOTAK_NEO_MOBILE_NUMBER, KOTAK_NEO_CLIENT_CODE")
+        print(f"   Missing: {', '.join(e.missing)}")
         sys.exit(1)
     
-    # Remove 'Bearer ' prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
+    return creds.access_token, creds.mobile_number, creds.client_code
+
+
+def authenticate(kotak_client):
+    """TOTP + MPIN login; caches the session on success."""
+    print("📋 Step 3: Authenticating with Kotak Neo...", flush=True)
+    print("   📱 Enter TOTP code from your authenticator app:")
+    totp = read_totp("   TOTP: ")
+    
+    started = time.perf_counter()
+    try:
+        kotak_client.login_with_totp(totp)
+        print("   ✅ TOTP login successful")
+        event("totp_login", "ok", latency_ms=round((time.perf_counter() - started) * 1000, 1))
+    except Exception as e:
+        print(f"   ❌ TOTP login failed: {e}")
+        event("totp_login", "error", error=str(e))
+        return False
+    
+    print("   🔐 Enter MPIN (trading PIN):")
+    mpin = read_mpin("   MPIN: ")
+    
+    started = time.perf_counter()
+    try:
+        kotak_client.validate_mpin(mpin)
+        print("   ✅ MPIN validation successful")
+        event("mpin", "ok", latency_ms=round((time.perf_counter() - started) * 1000, 1))
+    except Exception as e:
+        print(f"   ❌ MPIN validation failed: {e}")
+        event("mpin", "error", error=str(e))
+        return False
     
-    return access_token, mobile_number, client_code
+    save_session(kotak_client)
+    return True
 
 
 def test_live_data_paper_trading():
     """Test live data paper trading."""
-    print("=" * 60)
+    print(_BAR)
     print("Live Data Paper Trading Test")
-    print("=" * 60)
+    print(_BAR)
     print()
     
     # Load credentials
-    print("📋 Step 1: Loading credentials...")
+    print("📋 Step 1: Loading credentials...", flush=True)
     access_token, mobile_number, client_code = get_credentials()
     print("   ✅ Credentials loaded")
+    event("credentials", "ok")
     print()
     
     # Initialize Kotak Neo client
-    print("📋 Step 2: Initializing Kotak Neo API client...")
+    print("📋 Step 2: Initializing Kotak Neo API client...", flush=True)
     kotak_client = KotakNeoAPI(
         access_token=access_token,
         mobile_number=mobile_number,
-        client_code=client_code
+        client_code=client_code,
+        session=shared_session,
     )
     print("   ✅ Client initialized")
     print()
     
-    # Authenticate
-    print("📋 Step 3: Authenticating with Kotak Neo...")
-    print("   📱 Enter TOTP code from your authenticator app:")
-    totp = input("   TOTP: ").strip()
-    
-    try:
-        kotak_client.login_with_totp(totp)
-        print("   ✅ TOTP login successful")
-    except Exception as e:
-        print(f"   ❌ TOTP login failed: {e}")
-        return False
-    
-    print("   🔐 Enter MPIN (trading PIN):")
-    mpin = input("   MPIN: ").strip()
-    
-    try:
-        kotak_client.validate_mpin(mpin)
-        print("   ✅ MPIN validation successful")
-    except Exception as e:
-        print(f"   ❌ MPIN validation failed: {e}")
+    # Authenticate (reusing the last TOTP + MPIN login while still valid)
+    if load_cached_session(kotak_client):
+        print("📋 Step 3: Reusing cached Kotak Neo session (TOTP/MPIN skipped)", flush=True)
+        event("session", "cached", expires=kotak_client.token_expiry)
+        # The adapter below swallows API errors and falls back to other price
+        # sources, so confirm the broker still accepts the cached session here
+        try:
+            with_reauth(kotak_client, True, authenticate, kotak_client.get_positions)
+        except SessionRejected:
+            return False
+        except Exception as e:
+            print(f"   ⚠️  Session check failed: {e}")
+            event("session", "warn", error=str(e))
+    elif not authenticate(kotak_client):
         return False
     
     print()
     
     # Create live data paper adapter
-    print("📋 Step 4: Creating Live Data Paper Trading Adapter...")
+    print("📋 Step 4: Creating Live Data Paper Trading Adapter...", flush=True)
+    # Deferred: the trade-execution engine is only worth importing once
+    # credentials and login have succeeded
+    from aurum_harmony.engines.trade_execution.live_data_paper_adapter import LiveDataPaperAdapter
+    from aurum_harmony.engines.trade_execution.trade_execution import Order, OrderSide, OrderType
+    
     paper_adapter = LiveDataPaperAdapter(
         kotak_client=kotak_client,
         initial_balance=100000.0
@@ -102,20 +136,24 @@ def test_live_data_paper_trading():
     print()
     
     # Test fetching live prices
-    print("📋 Step 5: Testing live price fetching...")
+    print("📋 Step 5: Testing live price fetching...", flush=True)
     test_symbols = ["NIFTY50", "BANKNIFTY"]
     
     for symbol in test_symbols:
         print(f"   Fetching live price for {symbol}...")
+        started = time.perf_counter()
         price = paper_adapter._get_live_price(symbol)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
         if price:
             print(f"   ✅ {symbol}: ₹{price:,.2f} (Live from Kotak Neo)")
+            event("live_price", "ok", symbol=symbol, price=price, latency_ms=latency_ms)
         else:
             print(f"   ⚠️  {symbol}: Live price unavailable, will use fallback")
+            event("live_price", "warn", symbol=symbol, latency_ms=latency_ms)
     print()
     
     # Test paper order
-    print("📋 Step 6: Testing paper order execution...")
+    print("📋 Step 6: Testing paper order execution...", flush=True)
     print("   Placing a test BUY order for NIFTY50 (1 lot)...")
     
     test_order = Order(
@@ -132,13 +170,16 @@ def test_live_data_paper_trading():
         print(f"   ✅ Order filled at ₹{result.filled_price:,.2f}")
         print(f"   📊 Balance: ₹{paper_adapter.get_balance():,.2f}")
         print(f"   📈 Positions: {len(paper_adapter.get_positions())}")
+        event("paper_order", "ok", filled_price=result.filled_price)
     else:
         print(f"   ❌ Order {result.status.value}: {result.metadata.get('reason', 'Unknown')}")
+        event("paper_order", "fail", order_status=result.status.value,
+              reason=result.metadata.get('reason'))
     
     print()
     
     # Get statistics
-    print("📋 Step 7: Trading Statistics...")
+    print("📋 Step 7: Trading Statistics...", flush=True)
     stats = paper_adapter.get_statistics()
     print()
     print("   📊 Account Summary:")
@@ -170,9 +211,9 @@ def test_live_data_paper_trading():
     print(f"         → {stats.get('execution_mode_explanation', '')}")
     print()
     
-    print("=" * 60)
+    print(_BAR)
     print("✅ Live Data Paper Trading Test Complete!")
-    print("=" * 60)
+    print(_BAR)
     print()
     print("Your system is now using:")
     print("  ✅ Real-time market data from Kotak Neo")
@@ -192,6 +233,7 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print(f"\n\n❌ Unexpected error: {e}")
+        sys.stdout.flush()
         import traceback
         traceback.print_exc()
         sys.exit(1)
@@ -11,17 +11,21 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from flask import Flask
-from aurum_harmony.database.db import db, init_db
-from aurum_harmony.database.models import User
-from aurum_harmony.database.utils.password import PasswordService
+_BAR = "=" * 60
 
 
 def create_admin_user():
     """Create or update admin user with hardcoded credentials."""
-    print("=" * 60)
+    # Imported here rather than at module level: Flask + SQLAlchemy + models
+    # are the bulk of this script's startup time
+    from flask import Flask
+    from aurum_harmony.database.db import db, init_db
+    from aurum_harmony.database.models import User
+    from aurum_harmony.database.utils.password import PasswordService
+    
+    print(_BAR)
     print("Creating Admin User")
-    print("=" * 60)
+    print(_BAR)
     print()
     
     # Hardcoded admin credentials
@@ -43,17 +47,27 @@ def create_admin_user():
             
             if admin:
                 print(f"Admin user already exists: {ADMIN_EMAIL}")
-                print("Updating password and ensuring admin privileges...")
                 
-                # Update password
-                admin.password_hash = PasswordService.hash_password(ADMIN_PASSWORD)
-                admin.is_admin = True
-                admin.is_active = True
+                # Only touch fields that differ, and skip the commit when none
+                # do. bcrypt is slow on purpose, so the stored hash is verified
+                # and only recomputed when it no longer matches
+                dirty = False
+                if not PasswordService.verify_password(ADMIN_PASSWORD, admin.password_hash):
+                    admin.password_hash = PasswordService.hash_password(ADMIN_PASSWORD)
+                    dirty = True
+                desired = {"is_admin": True, "is_active": True}
                 if ADMIN_PHONE:
-                    admin.phone = ADMIN_PHONE
+                    desired["phone"] = ADMIN_PHONE
+                for field, value in desired.items():
+                    if getattr(admin, field) != value:
+                        setattr(admin, field, value)
+                        dirty = True
                 
-                db.session.commit()
-                print(f"✓ Admin user updated")
+                if dirty:
+                    db.session.commit()
+                    print(f"✓ Admin user updated")
+                else:
+                    print("✓ Admin user already up to date (no changes written)")
                 print(f"  Email: {ADMIN_EMAIL}")
                 print(f"  Password: {ADMIN_PASSWORD}")
                 print(f"  User Code: {admin.user_code}")
@@ -83,9 +97,9 @@ def create_admin_user():
                 print(f"  Is Admin: {admin.is_admin}")
         
         print()
-        print("=" * 60)
+        print(_BAR)
         print("✓ Admin user ready!")
-        print("=" * 60)
+        print(_BAR)
         print()
         print("You can now login with:")
         print(f"  Email: {ADMIN_EMAIL}")
@@ -2,10 +2,32 @@
 Test different HDFC Sky authentication methods
 """
 import os
-from dotenv import load_dotenv
-import requests
+import sys
+from pathlib import Path
+from urllib.parse import urlencode
 
-load_dotenv()
+# scripts/ holds the helpers shared by the broker and token test scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from _script_utils import (
+    RETRY_5XX,
+    completed,
+    configure_stdout,
+    dumps_compact,
+    event,
+    load_env,
+    loads,
+    pooled_session,
+    preview,
+    read_capped,
+)
+
+load_env()
+
+configure_stdout()
+
+# All attempts go to developer.hdfcsky.com; one keep-alive connection per
+# concurrent method
+session = pooled_session(4, max_retries=RETRY_5XX, headers={"Accept": "application/json"})
 
 api_key = os.getenv("HDFC_SKY_API_KEY")
 api_secret = os.getenv("HDFC_SKY_API_SECRET")
@@ -43,37 +65,44 @@ endpoints_to_try = [
     }
 ]
 
+# Encode every JSON body once up front rather than on each POST
+JSON_HEADERS = {"Content-Type": "application/json"}
 for method in endpoints_to_try:
+    data = method['data']
+    method['body'] = dumps_compact(data) if data is not None else None
+
+def try_method(method):
+    """POST one candidate auth method; returns the response."""
+    return session.post(
+        method['url'],
+        params=method['params'],
+        data=method['body'],
+        headers=JSON_HEADERS,
+        auth=method.get('auth'),
+        timeout=10,
+        stream=True
+    )
+
+# The methods are independent, so send them all at once and report each
+# as it lands. The first 200 wins, but the other requests are already in
+# flight and leaving the loop waits for them (bounded by their timeout)
+for method, future in completed(try_method, endpoints_to_try):
     print(f"Testing: {method['name']}")
     print(f"URL: {method['url']}")
     
     try:
-        headers = {"Content-Type": "application/json", "Accept": "application/json"}
-        
-        if method.get('auth'):
-            response = requests.post(
-                method['url'],
-                params=method['params'],
-                json=method['data'],
-                headers=headers,
-                auth=method['auth'],
-                timeout=10
-            )
-        else:
-            response = requests.post(
-                method['url'],
-                params=method['params'],
-                json=method['data'],
-                headers=headers,
-                timeout=10
-            )
+        response = future.result()
+        body = read_capped(response)
         
         print(f"Status: {response.status_code}")
-        print(f"Response: {response.text[:200]}")
+        event("access_token", "ok" if response.status_code == 200 else "fail",
+              method=method['name'], status_code=response.status_code,
+              latency_ms=round(response.elapsed.total_seconds() * 1000, 1))
+        print(f"Response: {preview(body)}")
         
         if response.status_code == 200:
             print("✅ SUCCESS!")
-            token_data = response.json()
+            token_data = loads(body)
             print(f"Access Token: {token_data.get('access_token', 'N/A')[:30]}...")
             break
         elif response.status_code == 401:
@@ -83,6 +112,7 @@ for method in endpoints_to_try:
         
     except Exception as e:
         print(f"❌ Exception: {e}")
+        event("access_token", "error", method=method['name'], error=str(e))
     
     print()
 
@@ -90,15 +120,19 @@ print("\n=== Also trying form-data format ===\n")
 
 # Try form-data format
 url = "https://developer.hdfcsky.com/oapi/v1/access-token"
-data = {"api_key": api_key, "api_secret": api_secret}
-headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
+data = urlencode({"api_key": api_key, "api_secret": api_secret}).encode()
+headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
 try:
-    response = requests.post(url, data=data, headers=headers, timeout=10)
+    response = session.post(url, data=data, headers=headers, timeout=10, stream=True)
     print(f"Form-data Status: {response.status_code}")
-    print(f"Form-data Response: {response.text[:200]}")
+    event("access_token", "ok" if response.status_code == 200 else "fail",
+          method="form-data", status_code=response.status_code,
+          latency_ms=round(response.elapsed.total_seconds() * 1000, 1))
+    print(f"Form-data Response: {preview(read_capped(response))}")
     if response.status_code == 200:
         print("✅ SUCCESS with form-data!")
 except Exception as e:
     print(f"❌ Exception: {e}")
+    event("access_token", "error", method="form-data", error=str(e))
 
@@ -2,23 +2,48 @@
 Detailed test for HDFC Sky access token with request token
 """
 import os
-from dotenv import load_dotenv
-import requests
-import json
+import sys
+from pathlib import Path
+from urllib.parse import urlencode
 
-load_dotenv()
+# scripts/ holds the helpers shared by the broker and token test scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from _script_utils import (
+    RETRY_5XX,
+    completed,
+    configure_stdout,
+    dumps_compact,
+    dumps_pretty,
+    event,
+    load_env,
+    loads,
+    pooled_session,
+    preview,
+    read_capped,
+)
+
+load_env()
+
+_BAR = "=" * 60
+_RULE = "-" * 60
+
+configure_stdout()
+
+# All attempts go to developer.hdfcsky.com; one keep-alive connection per
+# concurrent case
+session = pooled_session(6, max_retries=RETRY_5XX, headers={"Accept": "application/json"})
 
 api_key = os.getenv("HDFC_SKY_API_KEY")
 api_secret = os.getenv("HDFC_SKY_API_SECRET")
 request_token = os.getenv("HDFC_SKY_REQUEST_TOKEN")
 
-print("\n" + "="*60)
+print("\n" + _BAR)
 print("HDFC SKY ACCESS TOKEN TEST")
-print("="*60)
+print(_BAR)
 print(f"\nAPI Key: {api_key[:15]}... (length: {len(api_key) if api_key else 0})")
 print(f"API Secret: {api_secret[:15]}... (length: {len(api_secret) if api_secret else 0})")
 print(f"Request Token: {request_token[:30] if request_token else 'NOT SET'}...")
-print("\n" + "-"*60)
+print("\n" + _RULE)
 
 if not all([api_key, api_secret, request_token]):
     print("❌ Missing credentials!")
@@ -33,14 +58,14 @@ test_cases = [
         "name": "Method 1: API key + request_token in URL, secret in JSON body",
         "url": f"https://developer.hdfcsky.com/oapi/v1/access-token?api_key={api_key}&request_token={request_token}",
         "data": {"api_secret": api_secret},
-        "headers": {"Content-Type": "application/json", "Accept": "application/json"},
+        "headers": {"Content-Type": "application/json"},
         "method": "json"
     },
     {
         "name": "Method 2: API key + request_token in URL, secret in form-data",
         "url": f"https://developer.hdfcsky.com/oapi/v1/access-token?api_key={api_key}&request_token={request_token}",
         "data": {"api_secret": api_secret},
-        "headers": {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"},
+        "headers": {"Content-Type": "application/x-www-form-urlencoded"},
         "method": "form"
     },
     {
@@ -51,7 +76,7 @@ test_cases = [
             "api_secret": api_secret,
             "request_token": request_token
         },
-        "headers": {"Content-Type": "application/json", "Accept": "application/json"},
+        "headers": {"Content-Type": "application/json"},
         "method": "json"
     },
     {
@@ -62,7 +87,7 @@ test_cases = [
             "api_secret": api_secret,
             "request_token": request_token
         },
-        "headers": {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"},
+        "headers": {"Content-Type": "application/x-www-form-urlencoded"},
         "method": "form"
     },
     {
@@ -72,7 +97,7 @@ test_cases = [
             "api_secret": api_secret,
             "request_token": request_token
         },
-        "headers": {"Content-Type": "application/json", "Accept": "application/json"},
+        "headers": {"Content-Type": "application/json"},
         "method": "json"
     },
     {
@@ -82,48 +107,71 @@ test_cases = [
             "api_secret": api_secret,
             "request_token": request_token
         },
-        "headers": {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"},
+        "headers": {"Content-Type": "application/x-www-form-urlencoded"},
         "method": "form"
     }
 ]
 
-for i, test in enumerate(test_cases, 1):
+# Encode every body once up front; each case already carries its own
+# Content-Type, so requests can send the bytes as-is
+for test in test_cases:
+    if test['method'] == 'json':
+        test['body'] = dumps_compact(test['data'])
+    else:
+        test['body'] = urlencode(test['data']).encode()
+
+def try_case(case):
+    """POST one (number, test) candidate request format; returns the response."""
+    _, test = case
+    return session.post(test['url'], data=test['body'], headers=test['headers'], timeout=10, stream=True)
+
+# The formats are independent, so send them all at once and report each
+# as it lands. The first 200 wins, but the other requests are already in
+# flight and leaving the loop waits for them (bounded by their timeout)
+found = False
+for (i, test), future in completed(try_case, enumerate(test_cases, 1)):
     print(f"\n[{i}/{len(test_cases)}] Testing: {test['name']}")
     print(f"URL: {test['url'][:80]}...")
     print(f"Headers: {test['headers']}")
     print(f"Data keys: {list(test['data'].keys())}")
-    
+
     try:
-        if test['method'] == 'json':
-            response = requests.post(test['url'], json=test['data'], headers=test['headers'], timeout=10)
-        else:
-            response = requests.post(test['url'], data=test['data'], headers=test['headers'], timeout=10)
-        
+        response = future.result()
+        body = read_capped(response)
+    
         print(f"Status: {response.status_code}")
-        
+        event("access_token", "ok" if response.status_code == 200 else "fail",
+              method=test['name'], status_code=response.status_code,
+              latency_ms=round(response.elapsed.total_seconds() * 1000, 1))
+    
         if response.status_code == 200:
             print("✅ SUCCESS!")
             try:
-                result = response.json()
+                result = loads(body)
                 access_token = result.get('access_token', 'N/A')
                 print(f"Access Token: {access_token[:50]}...")
-                print(f"Full Response: {json.dumps(result, indent=2)}")
-                print("\n" + "="*60)
+                print(f"Full Response: {dumps_pretty(result)}")
+                print("\n" + _BAR)
                 print("🎉 WORKING METHOD FOUND!")
-                print("="*60)
-                exit(0)
-            except:
-                print(f"Response: {response.text[:200]}")
+                print(_BAR)
+                found = True
+                break
+            except Exception:
+                print(f"Response: {preview(body)}")
         else:
             print(f"❌ Error {response.status_code}")
-            print(f"Response: {response.text[:200]}")
-            
+            print(f"Response: {preview(body)}")
+        
     except Exception as e:
         print(f"❌ Exception: {str(e)}")
+        event("access_token", "error", method=test['name'], error=str(e))
+
+if found:
+    sys.exit(0)
 
-print("\n" + "="*60)
+print("\n" + _BAR)
 print("❌ None of the methods worked")
-print("="*60)
+print(_BAR)
 print("\nPossible issues:")
 print("  1. Request token might be expired or invalid")
 print("  2. API key/secret might be incorrect")
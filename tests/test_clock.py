@@ -0,0 +1,40 @@
+import contextvars
+import threading
+
+from engines import clock
+
+
+def _isolated(fn):
+    """Run fn in a copy of the current context so _ts changes don't leak."""
+    return contextvars.copy_context().run(fn)
+
+
+def test_stamp_reuses_recent_tick():
+    def body():
+        t = clock.tick()
+        assert clock.stamp() == t
+
+    _isolated(body)
+
+
+def test_stamp_refreshes_stale_tick():
+    def body():
+        clock.tick()
+        clock._ts.set((0, clock._ts.get()[1] - clock.MAX_AGE - 1))
+        assert clock.stamp() != 0
+
+    _isolated(body)
+
+
+def test_tick_is_per_thread():
+    def body():
+        clock._ts.set((123, float("inf")))
+        seen = []
+        worker = threading.Thread(target=lambda: seen.append(clock.stamp()))
+        worker.start()
+        worker.join()
+        assert seen[0] != 123
+        assert clock.stamp() == 123
+
+    _isolated(body)
+
@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask_cors")
+pytest.importorskip("cachetools")
+pytest.importorskip("orjson")
+
+# The gateway runs as a standalone app from its own directory (gunicorn
+# fabric_gateway:app), not as part of a package
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fabric" / "gateway"))
+import fabric_gateway  # noqa: E402
+from cachetools import TTLCache  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    def fake_query(function_name, args):
+        calls.append((function_name, args))
+        return {"status": "success", "function": function_name, "result": [len(calls)]}
+
+    monkeypatch.setattr(fabric_gateway, "_query_chaincode", fake_query)
+    monkeypatch.setattr(fabric_gateway, "_qcache", TTLCache(maxsize=16, ttl=60))
+    with fabric_gateway.app.test_client() as c:
+        c.calls = calls
+        yield c
+
+
+def _query(client, args):
+    return client.post("/query", json={"function": "QueryTrade", "args": args}).get_json()
+
+
+def test_repeated_query_is_served_from_cache(client):
+    first = _query(client, {"trade_id": "t1", "user_id": "u1"})
+    # Same args in another order map to the same cache key
+    second = _query(client, {"user_id": "u1", "trade_id": "t1"})
+    assert first == second
+    assert len(client.calls) == 1
+
+
+def test_different_args_miss_the_cache(client):
+    _query(client, {"trade_id": "t1"})
+    _query(client, {"trade_id": "t2"})
+    assert len(client.calls) == 2
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/invoke", {"function": "RecordTrade", "args": {}}),
+    ("/query/flush", {}),
+])
+def test_writes_and_flush_clear_the_cache(client, path, body):
+    _query(client, {"trade_id": "t1"})
+    client.post(path, json=body)
+    _query(client, {"trade_id": "t1"})
+    assert len(client.calls) == 2
+
+
+def test_disabled_cache_always_queries(client, monkeypatch):
+    monkeypatch.setattr(fabric_gateway, "_qcache", None)
+    _query(client, {"trade_id": "t1"})
+    _query(client, {"trade_id": "t1"})
+    assert len(client.calls) == 2
+
+
+def test_failed_stream_ends_with_error_record(client, monkeypatch):
+    def records(function_name, args):
+        yield {"trade_id": "t1"}
+        raise RuntimeError("ledger iterator closed")
+
+    monkeypatch.setattr(fabric_gateway, "_iter_query_chaincode", records)
+    response = client.post("/query/stream", json={"function": "QueryTrades", "args": {}})
+    lines = [fabric_gateway.orjson.loads(line) for line in response.data.splitlines()]
+    assert lines == [
+        {"trade_id": "t1"},
+        {"status": "ERROR", "message": "ledger iterator closed"},
+    ]
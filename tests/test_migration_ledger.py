@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from flask import Flask
+
+from aurum_harmony.database import migrate
+from aurum_harmony.database.db import init_db
+
+
+@pytest.fixture
+def app_context(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    app = Flask(__name__)
+    init_db(app)
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    calls = []
+    monkeypatch.setattr(migrate, "migrate_user_fields", lambda: calls.append(1))
+    return calls
+
+
+def test_record_marks_version_applied_for_that_digest(app_context):
+    assert not migrate.is_migration_applied("user_fields", "a" * 64)
+    migrate.record_migration("user_fields", "a" * 64)
+    assert migrate.is_migration_applied("user_fields", "a" * 64)
+    assert not migrate.is_migration_applied("user_fields", "b" * 64)
+
+
+def test_record_replaces_the_previous_digest(app_context):
+    migrate.record_migration("user_fields", "a" * 64)
+    migrate.record_migration("user_fields", "b" * 64)
+    assert migrate.is_migration_applied("user_fields", "b" * 64)
+    assert not migrate.is_migration_applied("user_fields", "a" * 64)
+
+
+def test_migration_runs_once_per_digest(app_context, runs, monkeypatch):
+    assert migrate.run_user_fields_migration()
+    assert not migrate.run_user_fields_migration()
+    assert len(runs) == 1
+
+    # Editing the migration code changes its digest, so it runs again
+    monkeypatch.setattr(migrate, "migration_digest", lambda: "c" * 64)
+    assert migrate.run_user_fields_migration()
+    assert len(runs) == 2
+
+
+def test_force_reruns_an_applied_migration(app_context, runs):
+    migrate.run_user_fields_migration()
+    assert migrate.run_user_fields_migration(force=True)
+    assert len(runs) == 2
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from engines.predictive_ai.Predictive_AI_Engine import PredictiveAIEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 5)).astype(np.float32)
+    # Direction follows the sign of the first feature, with a neutral band
+    y = np.where(X[:, 0] > 0.3, "bullish", np.where(X[:, 0] < -0.3, "bearish", "neutral"))
+    engine = PredictiveAIEngine()
+    engine.rf_model.set_params(n_estimators=20)
+    engine.rf_model.fit(X, y)
+    return engine
+
+
+def _features(rng, n):
+    names = ("rsi", "atr", "vix", "oi_change", "volume_spike")
+    return [dict(zip(names, row.tolist())) for row in rng.normal(size=(n, 5))]
+
+
+def test_predict_batch_matches_predict(engine):
+    feats = _features(np.random.default_rng(1), 25)
+    batch = engine.predict_batch(feats)
+    singles = [engine.predict(f) for f in feats]
+    for row, single in zip(batch, singles):
+        assert row["direction"] == single["direction"]
+        assert row["confidence"] == single["confidence"]
+
+
+def test_predict_batch_empty(engine):
+    assert engine.predict_batch([]) == []
+
+
+def test_low_confidence_is_neutral(engine):
+    engine.confidence_threshold = 1.01
+    try:
+        results = engine.predict_batch(_features(np.random.default_rng(2), 10))
+    finally:
+        engine.confidence_threshold = 0.70
+    assert {r["direction"] for r in results} == {"neutral"}
+
+
+def test_predict_lstm_requires_training():
+    with pytest.raises(ValueError):
+        PredictiveAIEngine().predict_lstm(np.zeros((10, 5)))
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from engines.risk_management.Risk_Management_Engine import RiskManagementEngine
+
+
+def test_var_cvar_use_the_lower_tail():
+    # 100 returns from -5.0% to +4.9%: the 5% quantile is the 6th smallest
+    # (-4.5%) and CVaR averages the six returns at or below it
+    returns = np.arange(-50, 50) / 1000
+    np.random.default_rng(0).shuffle(returns)
+    result = RiskManagementEngine().calculate_var_cvar(returns)
+    assert result["var_95"] == pytest.approx(-0.045)
+    assert result["cvar_95"] == pytest.approx(-0.0475)
+
+
+def test_cvar_never_exceeds_var():
+    returns = np.random.default_rng(1).normal(0.0, 0.01, 1000)
+    result = RiskManagementEngine().calculate_var_cvar(returns, confidence=0.99)
+    assert result["cvar_95"] <= result["var_95"]
+
+
+def test_var_cvar_of_short_series_is_the_worst_return():
+    result = RiskManagementEngine().calculate_var_cvar([0.01, -0.03, 0.02])
+    assert result == {"var_95": -0.03, "cvar_95": -0.03}
+
+
+def test_var_cvar_leaves_input_unsorted():
+    returns = np.array([0.03, -0.01, 0.02, -0.04])
+    RiskManagementEngine().calculate_var_cvar(returns)
+    assert returns.tolist() == [0.03, -0.01, 0.02, -0.04]
+
+
+@pytest.mark.parametrize("capital, peak", [(97.5, 100.0), (97.0, 100.0), (120.0, 100.0), (5.0, 0.0)])
+def test_check_drawdown_matches_batch(capital, peak):
+    engine = RiskManagementEngine()
+    single = engine.check_drawdown(capital, peak)
+    batch = engine.check_drawdown_batch(np.array([capital]), np.array([peak]))
+    assert single["ok"] == bool(batch["ok"][0])
+    assert single["drawdown_pct"] == round(float(batch["drawdown_pct"][0]), 5)
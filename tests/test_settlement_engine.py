@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from engines.settlement.Settlement_Engine import SettlementEngine
+
+
+def _engine(beta_phase):
+    engine = SettlementEngine()
+    engine.beta_phase = beta_phase
+    return engine
+
+
+def test_loss_rounds_symmetrically():
+    result = _engine(False).settle("u1", -1000.01)
+    assert result["platform_fee"] == -120.00
+    assert _engine(False).settle("u1", 1000.01)["platform_fee"] == 120.00
+
+
+@pytest.mark.parametrize("gross_profit", [25000.07, -25000.07, 0.01, -0.01, 333.33, -1234.55])
+def test_beta_sub_shares_add_up_to_platform_fee(gross_profit):
+    result = _engine(True).settle("u1", gross_profit)
+    paise = lambda key: round(result[key] * 100)
+    assert paise("saffronbolt_share") + paise("zenithpulse_share") == paise("platform_fee")
+    assert paise("platform_fee") + paise("net_to_user") == paise("gross_profit")
+
+
+def test_odd_paise_beta_split():
+    result = _engine(True).settle("u1", 25000.07)
+    assert result["platform_fee"] == 7500.02
+    assert result["saffronbolt_share"] == 5250.01
+    assert result["zenithpulse_share"] == 2250.01
+
+
+@pytest.mark.parametrize("beta_phase", [True, False])
+def test_settle_many_matches_settle(beta_phase):
+    engine = _engine(beta_phase)
+    profits = [25000.07, -25000.07, -1000.01, 0.05, -0.05, 12.345, 0.0]
+    user_ids = [f"u{i}" for i in range(len(profits))]
+    batch = engine.settle_many(user_ids, np.array(profits))
+    for user_id, gross_profit, row in zip(user_ids, profits, batch):
+        single = engine.settle(user_id, gross_profit)
+        single.pop("timestamp")
+        row.pop("timestamp")
+        assert row == single
+
+
+def test_settle_many_rejects_length_mismatch():
+    with pytest.raises(ValueError):
+        _engine(True).settle_many(["u1", "u2"], np.array([100.0]))
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from engines.predictive_ai.VIX_Adjustment_Logic import VIXAdjustment
+
+
+VIX_LEVELS = [10.0, 14.99, 15.0, 19.99, 20.0, 29.99, 30.0, 45.0]
+
+
+def test_adjust_series_matches_adjust():
+    engine = VIXAdjustment()
+    series = engine.adjust_series(np.array(VIX_LEVELS), 25000.0)
+    for i, vix in enumerate(VIX_LEVELS):
+        single = engine.adjust(vix, 25000.0)
+        assert series["capacity"][i] == single["capacity"]
+        assert series["target_return"][i] == single["target_return"]
+        assert series["adjusted_capital"][i] == single["adjusted_capital"]
+        assert series["trades_per_day"][i] == single["trades_per_day"]
+
+
+def test_adjust_series_win_rate_stays_in_bucket():
+    series = VIXAdjustment().adjust_series(np.full(10_000, 22.0), 10000.0)
+    assert series["win_rate"].min() >= 0.50
+    assert series["win_rate"].max() < 0.55
+
+
+def test_adjust_series_broadcasts_capitals():
+    series = VIXAdjustment().adjust_series(12.0, np.array([10000.0, 50000.0]))
+    assert series["adjusted_capital"].tolist() == [30000.0, 150000.0]
+    assert series["capacity"].shape == (2,)
+
+
+def test_adjust_series_rejects_mismatched_shapes():
+    with pytest.raises(ValueError):
+        VIXAdjustment().adjust_series(np.array([10.0, 20.0, 30.0]), np.array([1.0, 2.0]))